@@ -9,6 +9,107 @@ from typing import Optional
 # Global connection pool
 pool: Optional[asyncpg.Pool] = None
 
+# Hot timer queries, prepared once per pooled connection (see TimesheetConnection)
+TIMER_COLUMNS = "id, employee_id, employee_name, project_id, project_name, task, is_non_productive, start_time"
+
+PREPARED_STATEMENTS = {
+    "insert_active": """
+        INSERT INTO active_timers 
+        (id, employee_id, employee_name, project_id, project_name, task, is_non_productive, start_time)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    """,
+    "select_active_by_emp": f"""
+        SELECT {TIMER_COLUMNS}
+        FROM active_timers
+        WHERE employee_id = $1
+    """,
+    # Delete the active timer and insert it into time_records in one round-trip;
+    # returns the timer row (no row when the timer does not exist)
+    "stop_timer": f"""
+        WITH moved AS (
+            DELETE FROM active_timers
+            WHERE id = $1
+            RETURNING {TIMER_COLUMNS}
+        )
+        INSERT INTO time_records 
+        (id, employee_id, employee_name, project_id, project_name, task, 
+         is_non_productive, start_time, end_time, duration_seconds)
+        SELECT {TIMER_COLUMNS}, $2::timestamptz, $3::integer
+        FROM moved
+        RETURNING {TIMER_COLUMNS}
+    """,
+}
+
+class TimesheetConnection(asyncpg.Connection):
+    """Pooled connection carrying prepared statements for the timer endpoints"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = {}
+
+async def _prepare_statements(conn: TimesheetConnection):
+    """Pool init hook - parse and plan the hot queries once per connection"""
+    for name, sql in PREPARED_STATEMENTS.items():
+        conn.prepared[name] = await conn.prepare(sql)
+
+async def _create_tables(conn):
+    """Create tables and indexes if they don't exist"""
+    # Create active_timers table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS active_timers (
+            id VARCHAR(255) PRIMARY KEY,
+            employee_id VARCHAR(255) NOT NULL,
+            employee_name VARCHAR(255) NOT NULL,
+            project_id VARCHAR(255),
+            project_name VARCHAR(255),
+            task VARCHAR(255) NOT NULL,
+            is_non_productive BOOLEAN DEFAULT FALSE,
+            start_time TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """)
+    
+    # Create index on employee_id for faster lookups
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_active_timers_employee_id 
+        ON active_timers(employee_id)
+    """)
+    
+    # Create time_records table
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS time_records (
+            id VARCHAR(255) PRIMARY KEY,
+            employee_id VARCHAR(255) NOT NULL,
+            employee_name VARCHAR(255) NOT NULL,
+            project_id VARCHAR(255),
+            project_name VARCHAR(255),
+            task VARCHAR(255) NOT NULL,
+            is_non_productive BOOLEAN DEFAULT FALSE,
+            start_time TIMESTAMP WITH TIME ZONE NOT NULL,
+            end_time TIMESTAMP WITH TIME ZONE,
+            duration_seconds INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """)
+    
+    # Create indexes for time_records
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_time_records_employee_id 
+        ON time_records(employee_id)
+    """)
+    
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_time_records_start_time 
+        ON time_records(start_time)
+    """)
+    
+    # Serves the per-employee "latest first" queries (history, last task, summary)
+    # as a top-K index scan instead of fetching and sorting all matching rows
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_time_records_emp_end 
+        ON time_records(employee_id, end_time DESC)
+    """)
+
 async def init_db():
     """Initialize PostgreSQL connection pool and create tables"""
     global pool
@@ -36,65 +137,31 @@ async def init_db():
         return None
     
     try:
+        # Create tables first - pooled connections prepare statements against them
+        conn = await asyncpg.connect(db_url)
+        try:
+            await _create_tables(conn)
+        finally:
+            await conn.close()
+        
         # Create connection pool
+        # Size max_size for peak concurrency: a request that runs queries in parallel
+        # (asyncio.gather) holds one connection per branch while it runs
         pool = await asyncpg.create_pool(
             db_url,
-            min_size=1,
-            max_size=10,
-            command_timeout=60
+            min_size=int(os.environ.get('DB_POOL_MIN_SIZE', 10)),
+            max_size=int(os.environ.get('DB_POOL_MAX_SIZE', 50)),
+            # Recycle idle connections so dead ones (server restart, firewall timeout)
+            # are replaced instead of surfacing as errors on the next request
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=1024,
+            # Keep cached statements for the connection's lifetime
+            max_cached_statement_lifetime=0,
+            command_timeout=30,
+            connection_class=TimesheetConnection,
+            init=_prepare_statements
         )
         
-        # Create tables if they don't exist
-        async with pool.acquire() as conn:
-            # Create active_timers table
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS active_timers (
-                    id VARCHAR(255) PRIMARY KEY,
-                    employee_id VARCHAR(255) NOT NULL,
-                    employee_name VARCHAR(255) NOT NULL,
-                    project_id VARCHAR(255),
-                    project_name VARCHAR(255),
-                    task VARCHAR(255) NOT NULL,
-                    is_non_productive BOOLEAN DEFAULT FALSE,
-                    start_time TIMESTAMP WITH TIME ZONE NOT NULL,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-            
-            # Create index on employee_id for faster lookups
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_active_timers_employee_id 
-                ON active_timers(employee_id)
-            """)
-            
-            # Create time_records table
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS time_records (
-                    id VARCHAR(255) PRIMARY KEY,
-                    employee_id VARCHAR(255) NOT NULL,
-                    employee_name VARCHAR(255) NOT NULL,
-                    project_id VARCHAR(255),
-                    project_name VARCHAR(255),
-                    task VARCHAR(255) NOT NULL,
-                    is_non_productive BOOLEAN DEFAULT FALSE,
-                    start_time TIMESTAMP WITH TIME ZONE NOT NULL,
-                    end_time TIMESTAMP WITH TIME ZONE,
-                    duration_seconds INTEGER,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-            
-            # Create indexes for time_records
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_time_records_employee_id 
-                ON time_records(employee_id)
-            """)
-            
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_time_records_start_time 
-                ON time_records(start_time)
-            """)
-        
         logging.info("PostgreSQL database initialized successfully")
         return pool
         
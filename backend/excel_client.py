@@ -1,9 +1,16 @@
 import os
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from openpyxl import load_workbook, Workbook
 
+try:
+    # Rust-based reader, roughly 2x faster than openpyxl for plain reads
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 class ExcelClient:
     def __init__(self, file_path: str):
         """
@@ -14,7 +21,21 @@ class ExcelClient:
         """
         self.file_path = Path(file_path)
         self.workbook = None
+        # Rows waiting to be written, keyed by worksheet name. append_row only
+        # buffers; flush_pending() writes everything with a single save.
+        self._pending: Dict[str, List[List]] = {}
+        self._pending_headers: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self.max_pending_rows = 100
         
+    def file_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the Excel file - changes whenever the file is rewritten"""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
     def _load_workbook(self, force_reload=True):
         """Load workbook, create if doesn't exist - always reloads fresh data"""
         try:
@@ -50,75 +71,212 @@ class ExcelClient:
             logging.error(f"Error saving workbook: {e}")
             raise
     
-    def get_or_create_worksheet(self, worksheet_name: str, headers: List[str]):
-        """Get or create worksheet with headers - reloads workbook first"""
-        # Force reload workbook to ensure we have latest data
-        # This ensures any external changes are immediately visible
-        self._load_workbook()
+    def _fsync_file(self):
+        """Force the saved workbook to disk (best effort)"""
+        try:
+            # Windows only flushes handles opened for writing
+            fd = os.open(self.file_path, os.O_RDWR if os.name == 'nt' else os.O_RDONLY)
+        except OSError as e:
+            logging.debug(f"Could not open {self.file_path} for fsync: {e}")
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logging.debug(f"fsync not supported for {self.file_path}: {e}")
+        finally:
+            os.close(fd)
+    
+    def get_or_create_worksheet(self, worksheet_name: str, headers: List[str]) -> Tuple[object, bool]:
+        """
+        Get or create worksheet with headers - reloads workbook first
         
-        if worksheet_name not in self.workbook.sheetnames:
-            worksheet = self.workbook.create_sheet(worksheet_name)
-            worksheet.append(headers)
-            self._save_workbook()
-            logging.info(f"Created worksheet: {worksheet_name}")
+        Returns:
+            (worksheet, created) - created is True when the sheet was just added,
+            so callers know it only holds the header row and can skip reading it
+        """
+        with self._lock:
+            # Force reload workbook to ensure we have latest data
+            # This ensures any external changes are immediately visible
+            self._load_workbook()
+            
+            created = worksheet_name not in self.workbook.sheetnames
+            if created:
+                worksheet = self.workbook.create_sheet(worksheet_name)
+                worksheet.append(headers)
+                self._save_workbook()
+                logging.info(f"Created worksheet: {worksheet_name}")
+            
+            return self.workbook[worksheet_name], created
+    
+    @staticmethod
+    def _normalize_calamine_value(value):
+        """Map calamine cell values to what openpyxl returns (None for empty, int for whole numbers)"""
+        if value == "":
+            return None
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+    
+    def _read_rows_calamine(self, worksheet_name: str) -> Optional[List[tuple]]:
+        """Read raw rows with python-calamine, None if the worksheet does not exist"""
+        workbook = CalamineWorkbook.from_path(str(self.file_path))
+        if worksheet_name not in workbook.sheet_names:
+            return None
+        rows = workbook.get_sheet_by_name(worksheet_name).to_python()
+        normalize = self._normalize_calamine_value
+        return [tuple(normalize(value) for value in row) for row in rows]
+    
+    def _read_rows_openpyxl(self, worksheet_name: str) -> Optional[List[tuple]]:
+        """
+        Read raw rows with openpyxl in read-only mode, None if the worksheet does not exist
+        Read-only + data_only streams cell values without building styles or Cell objects
+        """
+        if not self.file_path.exists():
+            self._load_workbook()  # creates the file
         
-        return self.workbook[worksheet_name]
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            if worksheet_name not in workbook.sheetnames:
+                return None
+            rows = list(workbook[worksheet_name].iter_rows(values_only=True))
+        finally:
+            # Read-only workbooks keep the file open until closed
+            workbook.close()
+        
+        # Read-only sheets may return ragged rows - pad to the header width
+        width = len(rows[0]) if rows else 0
+        return [row if len(row) >= width else row + (None,) * (width - len(row)) for row in rows]
     
-    def get_worksheet_data(self, worksheet_name: str) -> List[Dict]:
-        """Read all data from worksheet - reloads workbook each time for live data"""
-        # Force reload workbook to get latest data from Excel file
-        # This ensures any external changes to the Excel file are immediately visible
-        self._load_workbook()
+    @staticmethod
+    def _is_empty_row(row: tuple) -> bool:
+        return not any(cell is not None and str(cell).strip() for cell in row)
+    
+    def iter_worksheet(self, worksheet_name: str) -> Tuple[Dict[str, int], Iterator[tuple]]:
+        """
+        Read worksheet as row tuples - reloads workbook each time for live data
         
-        if worksheet_name not in self.workbook.sheetnames:
+        Returns:
+            (header_to_idx, rows) - column index per header name and an iterator
+            over the non-empty data rows as tuples
+        """
+        with self._lock:
+            # Write any rows still buffered for this sheet so they are visible to the read
+            self.flush_pending(worksheet_name)
+            
+            if CalamineWorkbook is not None and self.file_path.exists():
+                rows = self._read_rows_calamine(worksheet_name)
+            else:
+                rows = self._read_rows_openpyxl(worksheet_name)
+        
+        if rows is None:
             logging.warning(f"Worksheet '{worksheet_name}' not found")
-            return []
+            return {}, iter(())
+        rows_iter = iter(rows)
         
-        worksheet = self.workbook[worksheet_name]
+        header_row = next(rows_iter, None)
+        if not header_row:
+            return {}, iter(())
+        header_to_idx = {(header if header else ""): i for i, header in enumerate(header_row)}
         
-        # Get headers from first row
-        headers = []
-        if worksheet.max_row > 0:
-            for cell in worksheet[1]:
-                headers.append(cell.value if cell.value else "")
-        
-        if not headers:
-            return []
-        
-        # Get data rows
-        records = []
-        for row in worksheet.iter_rows(min_row=2, values_only=True):
-            # Skip completely empty rows
-            if any(cell is not None and str(cell).strip() for cell in row if cell is not None):
-                record = {}
-                for i, header in enumerate(headers):
-                    value = row[i] if i < len(row) else None
-                    record[header] = value
-                records.append(record)
-        
-        return records
+        # Skip completely empty rows
+        is_empty = self._is_empty_row
+        return header_to_idx, (row for row in rows_iter if not is_empty(row))
+    
+    def get_worksheet_data(self, worksheet_name: str) -> List[Dict]:
+        """Read all data from worksheet as one dict per row (see iter_worksheet)"""
+        header_to_idx, rows = self.iter_worksheet(worksheet_name)
+        columns = list(header_to_idx.items())
+        return [{header: row[i] for header, i in columns} for row in rows]
     
-    def append_row(self, worksheet_name: str, row_data: List):
+    def append_row(self, worksheet_name: str, row_data: List, headers: Optional[List[str]] = None):
         """
-        Append a row to worksheet (automatically finds first free row)
-        Reloads workbook before appending to ensure we're working with latest data
+        Queue a row for appending to worksheet
+        Rows are buffered and written by flush_pending() so a burst of appends
+        costs one workbook load + save instead of one per row
         
         Args:
             worksheet_name: Name of the worksheet
             row_data: List of values to append
+            headers: Header row used if the worksheet has to be created on flush
+        """
+        return self.append_rows(worksheet_name, [row_data], headers=headers)
+    
+    def append_rows(self, worksheet_name: str, rows: List[List], headers: Optional[List[str]] = None):
         """
-        # Reload workbook to ensure we have latest data before appending
-        self._load_workbook()
+        Queue several rows for appending to worksheet (see append_row)
         
-        worksheet = self.get_or_create_worksheet(worksheet_name, [])
+        Args:
+            worksheet_name: Name of the worksheet
+            rows: List of rows, each a list of values
+            headers: Header row used if the worksheet has to be created on flush
+        """
+        with self._lock:
+            if headers:
+                self._pending_headers[worksheet_name] = list(headers)
+            pending = self._pending.setdefault(worksheet_name, [])
+            pending.extend(list(row) for row in rows)
+            pending_count = len(pending)
         
-        # Append row - openpyxl automatically finds the next free row
-        worksheet.append(row_data)
-        self._save_workbook()
+        logging.info(f"Queued {len(rows)} row(s) for '{worksheet_name}'")
         
-        logging.info(f"Appended row to '{worksheet_name}': {row_data}")
+        if pending_count >= self.max_pending_rows:
+            self.flush_pending()
         return True
     
+    def has_pending(self, worksheet_name: Optional[str] = None) -> bool:
+        """Check whether any rows (optionally for one worksheet) are waiting to be written"""
+        with self._lock:
+            if worksheet_name is None:
+                return bool(self._pending)
+            return bool(self._pending.get(worksheet_name))
+    
+    def flush_pending(self, worksheet_name: Optional[str] = None) -> int:
+        """
+        Write buffered rows to the Excel file with a single load + save
+        
+        Args:
+            worksheet_name: Only flush this worksheet (default: all worksheets)
+        
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            if worksheet_name is None:
+                batches = self._pending
+                self._pending = {}
+            elif self._pending.get(worksheet_name):
+                batches = {worksheet_name: self._pending.pop(worksheet_name)}
+            else:
+                batches = {}
+            
+            if not batches:
+                return 0
+            
+            try:
+                self._load_workbook()
+                for name, rows in batches.items():
+                    if name not in self.workbook.sheetnames:
+                        created = self.workbook.create_sheet(name)
+                        if self._pending_headers.get(name):
+                            created.append(self._pending_headers[name])
+                        logging.info(f"Created worksheet: {name}")
+                    worksheet = self.workbook[name]
+                    # openpyxl automatically finds the next free row
+                    for row in rows:
+                        worksheet.append(row)
+                self._save_workbook()
+                # Rows sat in memory until now - make the batch durable with one fsync
+                self._fsync_file()
+            except Exception:
+                # Put rows back in front of anything queued meanwhile so nothing is lost
+                for name, rows in batches.items():
+                    self._pending[name] = rows + self._pending.get(name, [])
+                raise
+        
+        written = sum(len(rows) for rows in batches.values())
+        logging.info(f"Flushed {written} buffered row(s) to: {', '.join(batches)}")
+        return written
+    
     def find_first_free_row(self, worksheet_name: str) -> int:
         """
         Find first empty row in worksheet (helper method)
@@ -133,12 +291,13 @@ class ExcelClient:
         worksheet = self.workbook[worksheet_name]
         
         # Find first completely empty row
-        for row_num in range(2, worksheet.max_row + 2):
-            row = worksheet[row_num]
-            if all(cell.value is None or str(cell.value).strip() == '' for cell in row):
+        last_row = 1
+        for row_num, row in enumerate(worksheet.iter_rows(min_row=2, values_only=True), start=2):
+            if all(cell is None or str(cell).strip() == '' for cell in row):
                 return row_num
+            last_row = row_num
         
-        return worksheet.max_row + 1
+        return last_row + 1
 
 # Global instance (will be initialized in server.py)
 excel_client = None
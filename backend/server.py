@@ -1,15 +1,23 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import os
+import sys
+import asyncio
+import functools
+import hashlib
+import time
+import zlib
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timezone, timedelta
 from excel_client import init_excel_client
 import excel_client as excel_client_module
 from database import init_db, close_db
@@ -38,9 +46,20 @@ if EXCEL_FILE_PATH:
 else:
     logging.warning("EXCEL_FILE_PATH not set - Excel features will be disabled")
 
-app = FastAPI()
+# orjson encodes the (datetime-heavy) timer/dashboard payloads natively and much faster than json
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
+if sys.version_info >= (3, 11):
+    # Python 3.11+ parses a trailing 'Z' natively
+    parse_iso_datetime = datetime.fromisoformat
+else:
+    def parse_iso_datetime(value: str) -> datetime:
+        """Parse ISO 8601 timestamp, accepting a trailing 'Z' for UTC"""
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+
 # Models
 class Employee(BaseModel):
     id: str
@@ -81,96 +100,193 @@ class StartTimerRequest(BaseModel):
 
 class StopTimerRequest(BaseModel):
     record_id: str
-    end_time: str
+    end_time: datetime
     duration_seconds: int
+    
+    @field_validator('end_time', mode='before')
+    @classmethod
+    def parse_end_time(cls, value):
+        """Parse the ISO string once when the request is read"""
+        if isinstance(value, str):
+            return parse_iso_datetime(value)
+        return value
+
+# Header rows of the Excel sheets finished timers are written to
+RECORD_HEADERS = [
+    "Datum", "Zaměstnanec ID", "Zaměstnanec", "Projekt ID", "Projekt", 
+    "Úkon", "Začátek", "Konec", "Doba trvání", "Doba (sekundy)"
+]
+NON_PRODUCTIVE_RECORD_HEADERS = [
+    "Datum", "Zaměstnanec ID", "Zaměstnanec", "Úkon", 
+    "Začátek", "Konec", "Doba trvání", "Doba (sekundy)"
+]
+
+# Active timers running longer than this show up as dashboard alerts
+LONG_RUNNING_ALERT_SECONDS = 4 * 3600
 
 # Helper functions (now handled by excel_client)
 
+@functools.lru_cache(maxsize=2)
+def _day_bounds(day: date):
+    """(today_start, week_start) in UTC for the given date - cached, so a new date evicts the old one"""
+    today_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return today_start, today_start - timedelta(days=day.weekday())
+
 def get_today_start():
-    now = datetime.now(timezone.utc)
-    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _day_bounds(datetime.now(timezone.utc).date())[0]
 
 def get_week_start():
-    now = datetime.now(timezone.utc)
-    start = now - timedelta(days=now.weekday())
-    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _day_bounds(datetime.now(timezone.utc).date())[1]
+
+# Employees recently seen without an active timer: employee_id -> expiry (time.monotonic()).
+# The frontend polls /timer/active for every employee on load; start/stop drop the entry
+NO_ACTIVE_TIMER_TTL = 1.0
+_no_active_timer: dict = {}
+
+# Parsed reference sheets: cache key (sheet name by default) -> (Excel file signature, built result)
+_sheet_cache: dict = {}
+# Sheets already checked/created by get_or_create_worksheet in this process
+_ensured_sheets: set = set()
+
+def _ensure_sheet(sheet_name: str, headers: List[str]) -> bool:
+    """Create the worksheet if missing, once per process; True if it was just created"""
+    if sheet_name in _ensured_sheets:
+        return False
+    _, created = excel_client_module.excel_client.get_or_create_worksheet(sheet_name, headers)
+    _ensured_sheets.add(sheet_name)
+    return created
+
+def _cached_sheet(sheet_name: str, headers: List[str], build, cache_key=None):
+    """
+    Return (file signature, build(columns, rows)) for a worksheet, re-reading the Excel file only when it changed
+    
+    columns maps header name -> column index and rows iterates the data rows as tuples
+    (both empty for a sheet that was just created). The result is cached until the file's
+    mtime/size changes, so external edits are still picked up on the next request.
+    Pass cache_key when the same sheet is built in more than one shape.
+    Blocking (Excel client lock, file I/O) - call it from a worker thread.
+    """
+    cache_key = cache_key or sheet_name
+    client = excel_client_module.excel_client
+    created = _ensure_sheet(sheet_name, headers)
+    
+    # Write queued rows first so the signature reflects them
+    client.flush_pending(sheet_name)
+    signature = client.file_signature()
+    cached = _sheet_cache.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached
+    
+    # A freshly created sheet only holds the header row
+    columns, rows = ({}, ()) if created else client.iter_worksheet(sheet_name)
+    cached = (signature, build(columns, rows))
+    _sheet_cache[cache_key] = cached
+    return cached
+
+def _sheet_response(request: Request, sheet_name: str, headers: List[str], build):
+    """
+    JSON response for a cached sheet with an ETag derived from the Excel file signature
+    Answers 304 Not Modified when the client already has the current version
+    """
+    signature, content = _cached_sheet(sheet_name, headers, build)
+    if signature is None:
+        return ORJSONResponse(content)
+    
+    # Sheet names are not latin-1 safe for headers - use a checksum to tell sheets apart
+    etag = f'W/"{signature[0]:x}-{signature[1]:x}-{zlib.crc32(sheet_name.encode()):x}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    return ORJSONResponse(content, headers=cache_headers)
+
+# The list builders produce plain dicts matching the Employee/Project/Task models;
+# the endpoints return them in an ORJSONResponse, which skips response_model
+# validation of data we built ourselves (response_model still documents the API)
+
+def _build_id_name(name_header: str):
+    """Builder for _cached_sheet: {id, name} for rows with both columns filled"""
+    def build(columns, rows):
+        id_i, name_i = columns.get('ID'), columns.get(name_header)
+        if id_i is None or name_i is None:
+            return []
+        return [{"id": str(row[id_i]), "name": str(row[name_i])} for row in rows if row[id_i] and row[name_i]]
+    return build
+
+def _build_dashboard_employees(columns, rows):
+    """Builder for _cached_sheet: {id, name} for every row with an ID (name may be empty)"""
+    id_i, name_i = columns.get('ID'), columns.get('Jméno')
+    if id_i is None:
+        return []
+    return [
+        {"id": str(row[id_i]), "name": str(row[name_i]) if name_i is not None and row[name_i] is not None else ''}
+        for row in rows if row[id_i]
+    ]
+
+def _build_task_names(sheet_name: str, default_tasks: List[str]):
+    """Builder for _cached_sheet: {name} per row, seeding default_tasks into an empty sheet"""
+    def build(columns, rows):
+        rows = list(rows)
+        if not rows:
+            excel_client_module.excel_client.append_rows(sheet_name, [[task] for task in default_tasks], headers=["Název"])
+            return [{"name": t} for t in default_tasks]
+        name_i = columns.get('Název')
+        if name_i is None:
+            return []
+        return [{"name": str(row[name_i])} for row in rows if row[name_i]]
+    return build
 
 @api_router.get("/")
 async def root():
     return {"message": "Timesheet API is running"}
 
 @api_router.get("/employees", response_model=List[Employee])
-async def get_employees():
+async def get_employees(request: Request):
     """Get all employees from Excel file"""
     if not excel_client_module.excel_client:
         raise HTTPException(status_code=500, detail="Excel file not configured")
     
     try:
-        excel_client_module.excel_client.get_or_create_worksheet("Zaměstnanci", ["ID", "Jméno"])
-        records = excel_client_module.excel_client.get_worksheet_data("Zaměstnanci")
-        employees = [Employee(id=str(r.get('ID', '')), name=str(r.get('Jméno', ''))) for r in records if r.get('ID') and r.get('Jméno')]
-        return employees
+        return await asyncio.to_thread(_sheet_response, request, "Zaměstnanci", ["ID", "Jméno"], _build_id_name('Jméno'))
     except Exception as e:
         logging.error(f"Error fetching employees: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects():
+async def get_projects(request: Request):
     """Get all projects from Excel file"""
     if not excel_client_module.excel_client:
         raise HTTPException(status_code=500, detail="Excel file not configured")
     
     try:
-        excel_client_module.excel_client.get_or_create_worksheet("Projekty", ["ID", "Název"])
-        records = excel_client_module.excel_client.get_worksheet_data("Projekty")
-        projects = [Project(id=str(r.get('ID', '')), name=str(r.get('Název', ''))) for r in records if r.get('ID') and r.get('Název')]
-        return projects
+        return await asyncio.to_thread(_sheet_response, request, "Projekty", ["ID", "Název"], _build_id_name('Název'))
     except Exception as e:
         logging.error(f"Error fetching projects: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks():
+async def get_tasks(request: Request):
     """Get all tasks from Excel file"""
     if not excel_client_module.excel_client:
         raise HTTPException(status_code=500, detail="Excel file not configured")
     
     try:
-        excel_client_module.excel_client.get_or_create_worksheet("Úkony", ["Název"])
-        records = excel_client_module.excel_client.get_worksheet_data("Úkony")
-        
         # If empty, add default tasks
-        if not records:
-            default_tasks = ["NAKLÁDKA", "VYKLÁDKA", "VYCHYSTÁVÁNÍ", "BALENÍ", "MANIPULACE"]
-            for task in default_tasks:
-                excel_client_module.excel_client.append_row("Úkony", [task])
-            tasks = [Task(name=t) for t in default_tasks]
-        else:
-            tasks = [Task(name=str(r.get('Název', ''))) for r in records if r.get('Název')]
-        return tasks
+        default_tasks = ["NAKLÁDKA", "VYKLÁDKA", "VYCHYSTÁVÁNÍ", "BALENÍ", "MANIPULACE"]
+        return await asyncio.to_thread(_sheet_response, request, "Úkony", ["Název"], _build_task_names("Úkony", default_tasks))
     except Exception as e:
         logging.error(f"Error fetching tasks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/non-productive-tasks", response_model=List[NonProductiveTask])
-async def get_non_productive_tasks():
+async def get_non_productive_tasks(request: Request):
     """Get all non-productive tasks from Excel file"""
     if not excel_client_module.excel_client:
         raise HTTPException(status_code=500, detail="Excel file not configured")
     
     try:
-        excel_client_module.excel_client.get_or_create_worksheet("Neproduktivní úkony", ["Název"])
-        records = excel_client_module.excel_client.get_worksheet_data("Neproduktivní úkony")
-        
         # If empty, add default non-productive tasks
-        if not records:
-            default_tasks = ["ÚKLID", "ŠROT", "MANIPULACE", "PŘEVÁŽENÍ"]
-            for task in default_tasks:
-                excel_client_module.excel_client.append_row("Neproduktivní úkony", [task])
-            tasks = [NonProductiveTask(name=t) for t in default_tasks]
-        else:
-            tasks = [NonProductiveTask(name=str(r.get('Název', ''))) for r in records if r.get('Název')]
-        return tasks
+        default_tasks = ["ÚKLID", "ŠROT", "MANIPULACE", "PŘEVÁŽENÍ"]
+        return await asyncio.to_thread(_sheet_response, request, "Neproduktivní úkony", ["Název"], _build_task_names("Neproduktivní úkony", default_tasks))
     except Exception as e:
         logging.error(f"Error fetching non-productive tasks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -182,7 +298,9 @@ async def start_timer(request: StartTimerRequest):
         if not database_module.pool:
             raise HTTPException(status_code=500, detail="Database not configured")
         
-        record = TimeRecord(
+        # asyncpg binds the datetime directly; the ISO string is only for the response
+        start_dt = datetime.now(timezone.utc)
+        record = TimeRecord.model_construct(
             employee_id=request.employee_id,
             employee_name=request.employee_name,
             project_id=request.project_id,
@@ -190,16 +308,12 @@ async def start_timer(request: StartTimerRequest):
             task=request.task,
             is_non_productive=request.is_non_productive,
             is_break=request.is_break,
-            start_time=datetime.now(timezone.utc).isoformat()
+            start_time=start_dt.isoformat()
         )
         
         # Insert into PostgreSQL
         async with database_module.pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO active_timers 
-                (id, employee_id, employee_name, project_id, project_name, task, is_non_productive, start_time)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, 
+            await conn.prepared["insert_active"].fetch(
                 record.id,
                 record.employee_id,
                 record.employee_name,
@@ -207,41 +321,41 @@ async def start_timer(request: StartTimerRequest):
                 record.project_name,
                 record.task,
                 record.is_non_productive,
-                datetime.fromisoformat(record.start_time.replace('Z', '+00:00'))
+                start_dt
             )
         
+        # Drop the cached "no timer" only once the row exists, so a poll racing the
+        # insert cannot cache it again and hide the new timer
+        _no_active_timer.pop(request.employee_id, None)
+        
         return record
     except Exception as e:
         logging.error(f"Error starting timer: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/timer/stop")
-async def stop_timer(request: StopTimerRequest):
-    """Stop a timer and save to Excel file"""
+async def stop_timer(request: StopTimerRequest, background_tasks: BackgroundTasks):
+    """Stop a timer and queue the record for the Excel file"""
     try:
         if not database_module.pool:
             raise HTTPException(status_code=500, detail="Database not configured")
         
-        # Get the active timer from PostgreSQL
+        # Move the timer from active_timers to time_records in a single statement
         async with database_module.pool.acquire() as conn:
-            timer_row = await conn.fetchrow("""
-                SELECT id, employee_id, employee_name, project_id, project_name, 
-                       task, is_non_productive, start_time
-                FROM active_timers
-                WHERE id = $1
-            """, request.record_id)
-            
-            if not timer_row:
-                raise HTTPException(status_code=404, detail="Timer not found")
-            
-            # Convert row to dict
-            timer = dict(timer_row)
-            timer['end_time'] = request.end_time
-            timer['duration_seconds'] = request.duration_seconds
-        
-        hours = request.duration_seconds // 3600
-        minutes = (request.duration_seconds % 3600) // 60
-        seconds = request.duration_seconds % 60
+            timer_row = await conn.prepared["stop_timer"].fetchrow(
+                request.record_id,
+                request.end_time,
+                request.duration_seconds
+            )
+        
+        if not timer_row:
+            raise HTTPException(status_code=404, detail="Timer not found")
+        
+        timer = dict(timer_row)
+        _no_active_timer.pop(timer['employee_id'], None)
+        
+        minutes, seconds = divmod(request.duration_seconds, 60)
+        hours, minutes = divmod(minutes, 60)
         duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         
         # Parse times for Excel
@@ -249,8 +363,12 @@ async def stop_timer(request: StopTimerRequest):
         if isinstance(start_time, datetime):
             start_dt = start_time
         else:
-            start_dt = datetime.fromisoformat(str(start_time).replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(request.end_time.replace('Z', '+00:00'))
+            start_dt = parse_iso_datetime(str(start_time))
+        end_dt = request.end_time
+        # Format once, shared by both sheet layouts
+        date_str = start_dt.strftime("%Y-%m-%d")
+        start_str = start_dt.strftime("%H:%M:%S")
+        end_str = end_dt.strftime("%H:%M:%S")
         
         # Save to Excel file - different sheet based on type
         if excel_client_module.excel_client:
@@ -258,66 +376,38 @@ async def stop_timer(request: StopTimerRequest):
             
             if is_non_productive:
                 # Save to non-productive records sheet
-                excel_client_module.excel_client.get_or_create_worksheet("Neproduktivní záznamy", [
-                    "Datum", "Zaměstnanec ID", "Zaměstnanec", "Úkon", 
-                    "Začátek", "Konec", "Doba trvání", "Doba (sekundy)"
-                ])
+                sheet_name, headers = "Neproduktivní záznamy", NON_PRODUCTIVE_RECORD_HEADERS
                 row = [
-                    start_dt.strftime("%Y-%m-%d"),
+                    date_str,
                     timer['employee_id'],
                     timer['employee_name'],
                     timer['task'],
-                    start_dt.strftime("%H:%M:%S"),
-                    end_dt.strftime("%H:%M:%S"),
+                    start_str,
+                    end_str,
                     duration_formatted,
                     request.duration_seconds
                 ]
-                excel_client_module.excel_client.append_row("Neproduktivní záznamy", row)
             else:
                 # Save to productive records sheet
-                excel_client_module.excel_client.get_or_create_worksheet("Záznamy", [
-                    "Datum", "Zaměstnanec ID", "Zaměstnanec", "Projekt ID", "Projekt", 
-                    "Úkon", "Začátek", "Konec", "Doba trvání", "Doba (sekundy)"
-                ])
+                sheet_name, headers = "Záznamy", RECORD_HEADERS
                 row = [
-                    start_dt.strftime("%Y-%m-%d"),
+                    date_str,
                     timer['employee_id'],
                     timer['employee_name'],
                     timer.get('project_id', ''),
                     timer.get('project_name', ''),
                     timer['task'],
-                    start_dt.strftime("%H:%M:%S"),
-                    end_dt.strftime("%H:%M:%S"),
+                    start_str,
+                    end_str,
                     duration_formatted,
                     request.duration_seconds
                 ]
-                excel_client_module.excel_client.append_row("Záznamy", row)
-        
-        # Remove from active timers and save to history
-        async with database_module.pool.acquire() as conn:
-            # Delete from active_timers
-            await conn.execute("DELETE FROM active_timers WHERE id = $1", request.record_id)
             
-            # Save to time_records
-            await conn.execute("""
-                INSERT INTO time_records 
-                (id, employee_id, employee_name, project_id, project_name, task, 
-                 is_non_productive, start_time, end_time, duration_seconds)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-            """,
-                timer['id'],
-                timer['employee_id'],
-                timer['employee_name'],
-                timer.get('project_id'),
-                timer.get('project_name'),
-                timer['task'],
-                timer.get('is_non_productive', False),
-                timer['start_time'],
-                datetime.fromisoformat(request.end_time.replace('Z', '+00:00')),
-                request.duration_seconds
-            )
+            # Runs in the threadpool after the response is sent - append_row may have
+            # to flush the buffer to the workbook, which must not block the event loop
+            background_tasks.add_task(excel_client_module.excel_client.append_row, sheet_name, row, headers)
         
-        return {"success": True, "message": "Timer stopped and saved to Excel file"}
+        return {"success": True, "message": "Timer stopped and saved; record queued for the Excel file"}
     except HTTPException:
         raise
     except Exception as e:
@@ -330,21 +420,18 @@ async def get_active_timer(employee_id: str):
         if not database_module.pool:
             return None
         
+        # Fast path: employee was just seen without a timer
+        if _no_active_timer.get(employee_id, 0) > time.monotonic():
+            return None
+        
         async with database_module.pool.acquire() as conn:
-            timer_row = await conn.fetchrow("""
-                SELECT id, employee_id, employee_name, project_id, project_name, 
-                       task, is_non_productive, start_time
-                FROM active_timers
-                WHERE employee_id = $1
-            """, employee_id)
-            
-            if timer_row:
-                timer = dict(timer_row)
-                # Convert start_time to ISO format string
-                if isinstance(timer['start_time'], datetime):
-                    timer['start_time'] = timer['start_time'].isoformat()
-                return timer
+            timer_row = await conn.prepared["select_active_by_emp"].fetchrow(employee_id)
+        
+        if not timer_row:
+            _no_active_timer[employee_id] = time.monotonic() + NO_ACTIVE_TIMER_TTL
             return None
+        # start_time stays a datetime - ORJSONResponse serializes it as ISO 8601
+        return dict(timer_row)
     except Exception as e:
         logging.error(f"Error getting active timer: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -362,15 +449,7 @@ async def get_all_active_timers():
                 FROM active_timers
             """)
             
-            timers = []
-            for row in rows:
-                timer = dict(row)
-                # Convert start_time to ISO format string
-                if isinstance(timer['start_time'], datetime):
-                    timer['start_time'] = timer['start_time'].isoformat()
-                timers.append(timer)
-            
-            return timers
+            return [dict(row) for row in rows]
     except Exception as e:
         logging.error(f"Error getting active timers: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -392,15 +471,7 @@ async def get_last_task(employee_id: str):
                 LIMIT 1
             """, employee_id)
             
-            if row:
-                record = dict(row)
-                # Convert datetime objects to ISO strings
-                if isinstance(record.get('start_time'), datetime):
-                    record['start_time'] = record['start_time'].isoformat()
-                if isinstance(record.get('end_time'), datetime):
-                    record['end_time'] = record['end_time'].isoformat()
-                return record
-            return None
+            return dict(row) if row else None
     except Exception as e:
         logging.error(f"Error getting last task: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -424,17 +495,7 @@ async def get_employee_history(employee_id: str, days: int = 7):
                 LIMIT 100
             """, employee_id, start_date)
             
-            records = []
-            for row in rows:
-                record = dict(row)
-                # Convert datetime objects to ISO strings
-                if isinstance(record.get('start_time'), datetime):
-                    record['start_time'] = record['start_time'].isoformat()
-                if isinstance(record.get('end_time'), datetime):
-                    record['end_time'] = record['end_time'].isoformat()
-                records.append(record)
-            
-            return records
+            return [dict(row) for row in rows]
     except Exception as e:
         logging.error(f"Error getting employee history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -449,8 +510,7 @@ async def get_employee_summary(employee_id: str):
                 "week": {"total_seconds": 0, "productive_seconds": 0, "non_productive_seconds": 0, "break_seconds": 0}
             }
         
-        today_start = get_today_start()
-        week_start = get_week_start()
+        today_start, week_start = _day_bounds(datetime.now(timezone.utc).date())
         
         async with database_module.pool.acquire() as conn:
             # Today's records
@@ -473,24 +533,20 @@ async def get_employee_summary(employee_id: str):
                 LIMIT 500
             """, employee_id, week_start)
             
-            def convert_records(rows):
-                records = []
-                for row in rows:
-                    record = dict(row)
-                    if isinstance(record.get('start_time'), datetime):
-                        record['start_time'] = record['start_time'].isoformat()
-                    if isinstance(record.get('end_time'), datetime):
-                        record['end_time'] = record['end_time'].isoformat()
-                    records.append(record)
-                return records
-            
-            today_records = convert_records(today_rows)
-            week_records = convert_records(week_rows)
+            today_records = [dict(row) for row in today_rows]
+            week_records = [dict(row) for row in week_rows]
         
         def calc_totals(records):
-            productive = sum(r.get('duration_seconds', 0) for r in records if not r.get('is_non_productive'))
-            non_productive = sum(r.get('duration_seconds', 0) for r in records if r.get('is_non_productive'))
-            breaks = 0  # breaks not stored separately in current schema
+            # Single pass over the records instead of one sum() per category
+            productive = non_productive = breaks = 0
+            for r in records:
+                duration = r.get('duration_seconds') or 0
+                if r.get('is_break'):  # breaks not stored separately in current schema
+                    breaks += duration
+                elif r.get('is_non_productive'):
+                    non_productive += duration
+                else:
+                    productive += duration
             return productive, non_productive, breaks
         
         today_prod, today_nonprod, today_breaks = calc_totals(today_records)
@@ -519,24 +575,27 @@ async def get_employee_summary(employee_id: str):
 async def get_admin_dashboard():
     """Get admin dashboard data with all employees stats"""
     try:
+        now = datetime.now(timezone.utc)
         if not database_module.pool:
             return {
                 "employees": [],
                 "summary": {"total_employees": 0, "working_now": 0, "on_break": 0, "today_total_seconds": 0, "week_total_seconds": 0},
                 "alerts": [],
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": now
             }
         
-        today_start = get_today_start()
-        week_start = get_week_start()
+        today_start, week_start = _day_bounds(now.date())
         
         # Get all employees from Excel
         employees = []
         if excel_client_module.excel_client:
             try:
-                excel_client_module.excel_client.get_or_create_worksheet("Zaměstnanci", ["ID", "Jméno"])
-                records = excel_client_module.excel_client.get_worksheet_data("Zaměstnanci")
-                employees = [{"id": str(r.get('ID', '')), "name": str(r.get('Jméno', ''))} for r in records if r.get('ID')]
+                # Same file-signature cache as /employees; run off the event loop since
+                # it takes the Excel client lock
+                _, employees = await asyncio.to_thread(
+                    _cached_sheet, "Zaměstnanci", ["ID", "Jméno"], _build_dashboard_employees,
+                    cache_key=("Zaměstnanci", "dashboard"),
+                )
             except Exception as e:
                 logging.error(f"Error fetching employees for dashboard: {e}")
         
@@ -548,14 +607,7 @@ async def get_admin_dashboard():
                 FROM active_timers
             """)
             
-            active_timers = []
-            active_map = {}
-            for row in active_rows:
-                timer = dict(row)
-                if isinstance(timer.get('start_time'), datetime):
-                    timer['start_time'] = timer['start_time'].isoformat()
-                active_timers.append(timer)
-                active_map[timer['employee_id']] = timer
+            active_map = {row['employee_id']: dict(row) for row in active_rows}
             
             # Get today's and week's records for all
             today_rows = await conn.fetch("""
@@ -574,19 +626,8 @@ async def get_admin_dashboard():
                 LIMIT 5000
             """, week_start)
             
-            def convert_records(rows):
-                records = []
-                for row in rows:
-                    record = dict(row)
-                    if isinstance(record.get('start_time'), datetime):
-                        record['start_time'] = record['start_time'].isoformat()
-                    if isinstance(record.get('end_time'), datetime):
-                        record['end_time'] = record['end_time'].isoformat()
-                    records.append(record)
-                return records
-            
-            today_records = convert_records(today_rows)
-            week_records = convert_records(week_rows)
+            today_records = [dict(row) for row in today_rows]
+            week_records = [dict(row) for row in week_rows]
             
             # Get last task for each employee
             last_tasks = {}
@@ -601,22 +642,20 @@ async def get_admin_dashboard():
                 """, emp['id'])
                 
                 if last_row:
-                    last = dict(last_row)
-                    if isinstance(last.get('start_time'), datetime):
-                        last['start_time'] = last['start_time'].isoformat()
-                    if isinstance(last.get('end_time'), datetime):
-                        last['end_time'] = last['end_time'].isoformat()
-                    last_tasks[emp['id']] = last
+                    last_tasks[emp['id']] = dict(last_row)
+        
+        # Bucket [today_secs, week_secs] per employee in one pass over the records
+        totals = defaultdict(lambda: [0, 0])
+        for r in today_records:
+            totals[r.get('employee_id')][0] += r.get('duration_seconds') or 0
+        for r in week_records:
+            totals[r.get('employee_id')][1] += r.get('duration_seconds') or 0
         
         # Build stats per employee
         employee_stats = []
         for emp in employees:
             emp_id = emp['id']
-            today_emp = [r for r in today_records if r.get('employee_id') == emp_id]
-            week_emp = [r for r in week_records if r.get('employee_id') == emp_id]
-            
-            today_secs = sum(r.get('duration_seconds', 0) for r in today_emp)
-            week_secs = sum(r.get('duration_seconds', 0) for r in week_emp)
+            today_secs, week_secs = totals.get(emp_id, (0, 0))
             
             active = active_map.get(emp_id)
             
@@ -643,27 +682,27 @@ async def get_admin_dashboard():
         working_count = sum(1 for s in employee_stats if s['is_working'])
         on_break_count = 0  # breaks not tracked separately
         
-        # Long running alerts (> 4 hours)
+        # Long running alerts (> 4 hours) - asyncpg already returns start_time as datetime
         alerts = []
-        for timer in active_timers:
-            start_str = timer.get('start_time', '')
-            if start_str:
-                try:
-                    if isinstance(start_str, str):
-                        start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                    else:
-                        start = start_str
-                    elapsed = (datetime.now(timezone.utc) - start).total_seconds()
-                    if elapsed > 4 * 3600:  # 4 hours
-                        alerts.append({
-                            "type": "long_running",
-                            "employee_name": timer['employee_name'],
-                            "task": timer.get('task'),
-                            "hours": round(elapsed / 3600, 1),
-                            "message": f"{timer['employee_name']} pracuje už {round(elapsed/3600, 1)} hodin"
-                        })
-                except Exception as e:
-                    logging.debug(f"Error calculating elapsed time for alert: {e}")
+        for row in active_rows:
+            start = row['start_time']
+            if not start:
+                continue
+            try:
+                if not isinstance(start, datetime):
+                    start = parse_iso_datetime(str(start))
+                elapsed = (now - start).total_seconds()
+                if elapsed > LONG_RUNNING_ALERT_SECONDS:
+                    hours = round(elapsed / 3600, 1)
+                    alerts.append({
+                        "type": "long_running",
+                        "employee_name": row['employee_name'],
+                        "task": row['task'],
+                        "hours": hours,
+                        "message": f"{row['employee_name']} pracuje už {hours} hodin"
+                    })
+            except Exception as e:
+                logging.debug(f"Error calculating elapsed time for alert: {e}")
         
         return {
             "employees": employee_stats,
@@ -675,7 +714,7 @@ async def get_admin_dashboard():
                 "week_total_seconds": total_week
             },
             "alerts": alerts,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now
         }
     except Exception as e:
         logging.error(f"Error getting admin dashboard: {e}")
@@ -693,25 +732,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and frontend assets (small responses are not worth it)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for the React build's fingerprinted assets - safe to cache forever"""
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 # Serve React frontend static files
 frontend_build_dir = PROJECT_ROOT / "frontend" / "build"
 static_dir = frontend_build_dir / "static"
 if frontend_build_dir.exists() and static_dir.exists():
-    # Serve static files (JS, CSS, images, etc.)
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    # Serve static files (JS, CSS, images, etc.) - CRA puts a content hash in every file name
+    app.mount("/static", ImmutableStaticFiles(directory=str(static_dir)), name="static")
+    
+    # index.html only changes on deploy - keep it in memory instead of re-reading per request
+    index_file = frontend_build_dir / "index.html"
+    INDEX_HTML = index_file.read_bytes() if index_file.exists() else None
+    INDEX_ETAG = f'"{hashlib.blake2b(INDEX_HTML, digest_size=8).hexdigest()}"' if INDEX_HTML is not None else None
+    
+    # Unknown /api paths end here (registered after api_router, before the SPA
+    # catch-all) so serve_react_app never sees API requests
+    @app.api_route("/api/{rest:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"], include_in_schema=False)
+    async def api_not_found(rest: str):
+        raise HTTPException(status_code=404, detail="Not found")
     
     # Serve React app for all non-API routes
-    @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
+    @app.get("/{full_path:path}", include_in_schema=False)
+    async def serve_react_app(full_path: str, request: Request):
         """Serve React app for all non-API routes"""
-        # Don't serve API routes
-        if full_path.startswith("api"):
-            raise HTTPException(status_code=404, detail="Not found")
-        
-        # Serve index.html for React Router
-        index_file = frontend_build_dir / "index.html"
-        if index_file.exists():
-            return FileResponse(str(index_file))
+        # Serve index.html for React Router - no-cache makes browsers revalidate,
+        # which costs a 304 until the next deploy changes the ETag
+        if INDEX_HTML is not None:
+            headers = {"ETag": INDEX_ETAG, "Cache-Control": "no-cache"}
+            if request.headers.get("if-none-match") == INDEX_ETAG:
+                return Response(status_code=304, headers=headers)
+            return Response(content=INDEX_HTML, media_type="text/html", headers=headers)
         else:
             raise HTTPException(status_code=404, detail="Frontend not built")
     
@@ -728,9 +788,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How often buffered Excel rows are written to the workbook (seconds)
+EXCEL_FLUSH_INTERVAL = float(os.environ.get('EXCEL_FLUSH_INTERVAL', 5))
+excel_flush_task: Optional[asyncio.Task] = None
+
+async def _periodic_excel_flush():
+    """Write rows buffered by append_row to the Excel file every EXCEL_FLUSH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(EXCEL_FLUSH_INTERVAL)
+        client = excel_client_module.excel_client
+        if not client:
+            continue
+        try:
+            # openpyxl load/save is blocking and the client lock may be held by another
+            # flush - keep both off the event loop (flush_pending returns 0 when idle)
+            await asyncio.to_thread(client.flush_pending)
+        except Exception as e:
+            logging.error(f"Error flushing buffered Excel rows: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    global excel_flush_task
     try:
         result = await init_db()
         if result:
@@ -739,14 +818,34 @@ async def startup_event():
             logging.warning("Database initialization returned None - PostgreSQL features disabled")
     except Exception as e:
         logging.error(f"Failed to initialize database on startup: {e}", exc_info=True)
+    
+    excel_flush_task = asyncio.create_task(_periodic_excel_flush())
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connections on shutdown"""
+    """Flush buffered Excel rows and close database connections on shutdown"""
+    if excel_flush_task:
+        excel_flush_task.cancel()
+    if excel_client_module.excel_client:
+        try:
+            await asyncio.to_thread(excel_client_module.excel_client.flush_pending)
+        except Exception as e:
+            logging.error(f"Error flushing buffered Excel rows on shutdown: {e}")
     await close_db()
 
 # Main entry point for running the server
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get('PORT', 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Each worker is a separate process with its own Excel row buffer, and their flushes
+    # can overwrite each other's rows in the shared workbook - raise only knowingly
+    workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+    uvicorn.run(
+        "server:app" if workers > 1 else app,  # multiple workers need an import string
+        app_dir=str(ROOT_DIR),
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop is not available on Windows
+        http="httptools"
+    )
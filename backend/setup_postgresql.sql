@@ -49,3 +49,6 @@ ON time_records(employee_id);
 CREATE INDEX IF NOT EXISTS idx_time_records_start_time 
 ON time_records(start_time);
 
+-- Index for per-employee "latest first" queries (history, last task, summary)
+CREATE INDEX IF NOT EXISTS idx_time_records_emp_end 
+ON time_records(employee_id, end_time DESC);
@@ -3,10 +3,17 @@ Test script to verify Excel file reloading works
 This tests that changes to Excel file are immediately reflected in API calls
 """
 import requests
+from requests.adapters import HTTPAdapter
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8000/api"
 
+# One keep-alive session for all calls instead of a new connection per request
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 print("=" * 60)
 print("Excel File Reload Test")
 print("=" * 60)
@@ -15,18 +22,21 @@ print()
 # Test 1: Get employees first time
 print("[1] First API call - Getting employees...")
 try:
-    response = requests.get(f"{BASE_URL}/employees")
+    response = session.get(f"{BASE_URL}/employees", timeout=30)
     if response.status_code == 200:
         employees1 = response.json()
+        etag1 = response.headers.get("ETag")
         print(f"✅ Found {len(employees1)} employees")
         if employees1:
             print(f"   Sample: {employees1[0]}")
     else:
         print(f"❌ Error: {response.status_code} - {response.text}")
+        session.close()
         exit(1)
 except Exception as e:
     print(f"❌ Error connecting to server: {e}")
     print("   Make sure the server is running: pipenv run python server.py")
+    session.close()
     exit(1)
 
 print()
@@ -35,8 +45,14 @@ print()
 print("[2] Second API call - Getting employees again (should reload)...")
 time.sleep(1)  # Small delay
 try:
-    response = requests.get(f"{BASE_URL}/employees")
-    if response.status_code == 200:
+    # Conditional request - the server answers 304 without a body while the
+    # Excel file is unchanged, and a fresh 200 as soon as it is edited
+    headers = {"If-None-Match": etag1} if etag1 else {}
+    response = session.get(f"{BASE_URL}/employees", headers=headers, timeout=30)
+    if response.status_code == 304:
+        employees2 = employees1
+        print(f"✅ Not modified - Excel file unchanged, reusing {len(employees2)} employees")
+    elif response.status_code == 200:
         employees2 = response.json()
         print(f"✅ Found {len(employees2)} employees")
         if employees2:
@@ -49,44 +65,41 @@ try:
             print(f"   ⚠️  Different count: {len(employees1)} vs {len(employees2)}")
     else:
         print(f"❌ Error: {response.status_code} - {response.text}")
+        session.close()
         exit(1)
 except Exception as e:
     print(f"❌ Error: {e}")
+    session.close()
     exit(1)
 
 print()
 
-# Test 3: Get projects
-print("[3] Getting projects (should reload Excel)...")
-try:
-    response = requests.get(f"{BASE_URL}/projects")
-    if response.status_code == 200:
-        projects = response.json()
-        print(f"✅ Found {len(projects)} projects")
-        if projects:
-            print(f"   Sample: {projects[0]}")
-    else:
-        print(f"❌ Error: {response.status_code} - {response.text}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+# Tests 3 and 4 are independent reads - send both requests at once and
+# report them in order
+executor = ThreadPoolExecutor(max_workers=2)
+pending = {
+    "projects": executor.submit(session.get, f"{BASE_URL}/projects", timeout=30),
+    "tasks": executor.submit(session.get, f"{BASE_URL}/tasks", timeout=30),
+}
 
-print()
+for step, name in ((3, "projects"), (4, "tasks")):
+    print(f"[{step}] Getting {name} (should reload Excel)...")
+    try:
+        response = pending[name].result()
+        if response.status_code == 200:
+            items = response.json()
+            print(f"✅ Found {len(items)} {name}")
+            if items:
+                print(f"   Sample: {items[0]}")
+        else:
+            print(f"❌ Error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    print()
 
-# Test 4: Get tasks
-print("[4] Getting tasks (should reload Excel)...")
-try:
-    response = requests.get(f"{BASE_URL}/tasks")
-    if response.status_code == 200:
-        tasks = response.json()
-        print(f"✅ Found {len(tasks)} tasks")
-        if tasks:
-            print(f"   Sample: {tasks[0]}")
-    else:
-        print(f"❌ Error: {response.status_code} - {response.text}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+executor.shutdown()
+session.close()
 
-print()
 print("=" * 60)
 print("✅ TEST COMPLETE")
 print("=" * 60)
@@ -111,6 +111,10 @@ class LoadingTimesheetService(win32serviceutil.ServiceFramework):
                 app=app,
                 host=host,
                 port=port,
+                loop="asyncio",  # uvloop is not available on Windows
+                http="httptools",  # C parser instead of pure-Python h11
+                limit_concurrency=1024,
+                timeout_keep_alive=30,
                 log_config=None,  # Use our own logging
                 access_log=False
             )
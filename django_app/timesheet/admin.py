@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User, Group
+from django.db.models import Count, Prefetch
 
 from .models import InventoryScan
 
@@ -40,11 +41,18 @@ class UserAdmin(BaseUserAdmin):
     fieldsets = BaseUserAdmin.fieldsets
     fieldsets[1][1]['fields'] = ('first_name', 'last_name', 'email')
 
+    def get_queryset(self, request):
+        # Load all groups for the page in one query instead of one per row
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('groups', queryset=Group.objects.only('name'))
+        )
+
     def get_groups(self, obj):
         """Display user's groups"""
-        groups = obj.groups.all()
-        if groups:
-            return ', '.join([group.name for group in groups])
+        # Served from the prefetch cache, no query per row
+        names = [group.name for group in obj.groups.all()]
+        if names:
+            return ', '.join(names)
         return 'No groups'
     get_groups.short_description = 'Groups'
 
@@ -69,7 +77,12 @@ class GroupAdmin(admin.ModelAdmin):
     list_display = ('name', 'get_user_count')
     search_fields = ('name',)
 
+    def get_queryset(self, request):
+        # Count users for all groups in one GROUP BY query instead of one per row
+        return super().get_queryset(request).annotate(_user_count=Count('user'))
+
     def get_user_count(self, obj):
         """Display number of users in group"""
-        return obj.user_set.count()
+        return obj._user_count
     get_user_count.short_description = 'Users'
+    get_user_count.admin_order_field = '_user_count'
@@ -1,8 +1,11 @@
 from django.apps import AppConfig
 import os
+import re
 import logging
 from pathlib import Path
-from .excel_client import ExcelClient
+
+# Users\admsoc with the \a turned into a bell character by escape processing
+_ADMSOC_RE = re.compile(r'Users[\\/]\x07?dmsoc')
 
 
 class TimesheetConfig(AppConfig):
@@ -11,6 +14,24 @@ class TimesheetConfig(AppConfig):
     
     def ready(self):
         """Initialize Excel client when app is ready"""
+        # Get base directory (django_app folder)
+        BASE_DIR = Path(__file__).resolve().parent.parent
+        # Scan django_app directory for Excel files once (scandir reuses the entry type
+        # from the directory listing instead of a stat per file)
+        with os.scandir(BASE_DIR) as entries:
+            excel_files_in_dir = sorted(
+                entry.name for entry in entries
+                if entry.name.endswith('.xlsx') and entry.is_file()
+            )
+        
+        if excel_files_in_dir:
+            # Simplest approach: use the first Excel file found in django_app directory
+            # (takes precedence over EXCEL_FILE_PATH, so no need to parse it)
+            file_path = BASE_DIR / excel_files_in_dir[0]
+            logging.info(f"Using Excel file found in django_app directory: {file_path}")
+            self._init_excel_client(file_path)
+            return
+        
         # Environment variables are already loaded by settings.py
         excel_file_path = os.environ.get('EXCEL_FILE_PATH', '').strip()
         
@@ -28,63 +49,50 @@ class TimesheetConfig(AppConfig):
                 # Path was corrupted by escape sequence - reconstruct it
                 excel_file_path = excel_file_path.replace('\x07', 'a').replace('\\x07', 'a')
                 # Reconstruct the path - look for pattern like Users\x07dmsoc and fix it
-                import re
-                excel_file_path = re.sub(r'Users[\\/]\x07?dmsoc', r'Users\admsoc', excel_file_path)
+                excel_file_path = _ADMSOC_RE.sub(r'Users\\admsoc', excel_file_path)
                 excel_file_path = excel_file_path.replace('\\x07', 'a')
         
-        # If empty, try to find Excel file in django_app directory
-        if not excel_file_path:
-            BASE_DIR = Path(__file__).resolve().parent.parent  # django_app directory
-            # Look for Excel files in django_app directory
-            excel_files = list(BASE_DIR.glob('*.xlsx'))
-            if excel_files:
-                excel_file_path = excel_files[0].name  # Just the filename for relative path
-                logging.info(f"Auto-detected Excel file: {excel_file_path}")
-        
         if excel_file_path:
             try:
-                # Get base directory (django_app folder)
-                BASE_DIR = Path(__file__).resolve().parent.parent
-                
-                # First, try to find Excel file in django_app directory (simplest approach)
-                excel_files_in_dir = list(BASE_DIR.glob('*.xlsx'))
-                if excel_files_in_dir:
-                    # Use the first Excel file found in django_app directory
-                    file_path = excel_files_in_dir[0]
-                    logging.info(f"Using Excel file found in django_app directory: {file_path}")
-                else:
-                    # Handle the path from .env file
-                    # Check if path looks absolute (starts with drive letter)
-                    is_absolute = len(excel_file_path) > 1 and excel_file_path[1] == ':'
-                    
-                    if is_absolute:
-                        # Absolute path - fix escape sequences
-                        clean_path = excel_file_path.replace('\x07', 'a').replace('\\x07', 'a')
-                        clean_path = clean_path.replace('Usersadmsoc', 'Users\\admsoc')
-                        # Fix double backslashes
-                        clean_path = clean_path.replace('\\\\', '\\')
-                        file_path = Path(clean_path)
-                    else:
-                        # Relative path - resolve from django_app directory
-                        file_path = (BASE_DIR / excel_file_path).resolve()
-                
-                logging.info(f"Resolved Excel file path: {file_path}")
-                logging.info(f"File exists: {file_path.exists()}")
+                # Handle the path from .env file
+                # Check if path looks absolute (starts with drive letter)
+                is_absolute = len(excel_file_path) > 1 and excel_file_path[1] == ':'
                 
-                if not file_path.exists():
-                    logging.warning(f"Excel file not found at: {file_path}")
-                    # List available Excel files for debugging
-                    all_excel_files = list(BASE_DIR.glob('*.xlsx'))
-                    if all_excel_files:
-                        logging.info(f"Available Excel files in django_app: {[str(f.name) for f in all_excel_files]}")
-                    self.excel_client = None
+                if is_absolute:
+                    # Absolute path - fix escape sequences
+                    clean_path = excel_file_path.replace('\x07', 'a').replace('\\x07', 'a')
+                    clean_path = clean_path.replace('Usersadmsoc', 'Users\\admsoc')
+                    # Fix double backslashes
+                    clean_path = clean_path.replace('\\\\', '\\')
+                    file_path = Path(clean_path)
                 else:
-                    self.excel_client = ExcelClient(str(file_path))
-                    logging.info(f"✓ Excel client initialized successfully with file: {file_path}")
+                    # Relative path - resolve from django_app directory
+                    file_path = (BASE_DIR / excel_file_path).resolve()
             except Exception as e:
                 logging.error(f"Failed to initialize Excel client: {e}", exc_info=True)
                 self.excel_client = None
+                return
+            self._init_excel_client(file_path)
         else:
             logging.warning("EXCEL_FILE_PATH not set in environment variables")
             logging.warning("Excel features will be disabled. Set EXCEL_FILE_PATH in django_app/.env file")
             self.excel_client = None
+    
+    def _init_excel_client(self, file_path):
+        """Create the Excel client for a resolved path (None if the file is missing)"""
+        try:
+            logging.info(f"Resolved Excel file path: {file_path}")
+            file_exists = file_path.exists()
+            logging.info(f"File exists: {file_exists}")
+            
+            if not file_exists:
+                logging.warning(f"Excel file not found at: {file_path}")
+                self.excel_client = None
+            else:
+                # Imported here so openpyxl/requests only load when an Excel file is configured
+                from .excel_client import ExcelClient
+                self.excel_client = ExcelClient(str(file_path))
+                logging.info(f"✓ Excel client initialized successfully with file: {file_path}")
+        except Exception as e:
+            logging.error(f"Failed to initialize Excel client: {e}", exc_info=True)
+            self.excel_client = None
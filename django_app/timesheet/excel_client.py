@@ -1,12 +1,99 @@
 import os
+import re
 import logging
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional
+from datetime import date, datetime
+from typing import Iterator, List, Dict, Optional, Tuple
 from openpyxl import load_workbook, Workbook
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, quote
 import time
+import weakref
+
+try:
+    # Rust-based reader, much faster than openpyxl for plain reads
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+
+# Access tokens shared by all SharePointAuth instances for the process lifetime,
+# keyed by (tenant_id, client_id, sharepoint_site) -> (access_token, expires_at)
+_TOKEN_CACHE: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+
+# Site name and server-relative file path in /sites/SiteName/...
+_SP_SITE_PATH_RE = re.compile(r'/sites/([^/]*)/?(.*)')
+
+
+@functools.lru_cache(maxsize=32)
+def _sharepoint_api_url(url: str) -> str:
+    """
+    Convert SharePoint web URL to REST API URL
+    Cached - the same URL is converted for every download and upload
+    """
+    # Parse the URL
+    parsed = urlparse(url)
+
+    # Extract site and file path
+    # URL format: https://tenant.sharepoint.com/sites/SiteName/...
+    match = _SP_SITE_PATH_RE.search(parsed.path)
+    if match:
+        site_name, file_path = match.groups()
+        # URL encode the path (query parameters were already split off)
+        file_path = quote(file_path, safe='/')
+
+        return (
+            f"{parsed.scheme}://{parsed.netloc}/sites/{site_name}/"
+            f"_api/web/GetFileByServerRelativeUrl('{file_path}')/$value"
+        )
+    else:
+        # Fallback: try direct download URL
+        return url.split('?')[0] + '?download=1'
+
+
+def _create_http_session() -> requests.Session:
+    """HTTP session that keeps connections alive between requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _cleanup_tempfile(path: str):
+    """Delete a downloaded SharePoint temp file (weakref.finalize callback)"""
+    try:
+        os.unlink(path)
+        logging.debug(f"Cleaned up temporary file: {path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Failed to cleanup temporary file: {e}")
+
+
+def _normalize_calamine_value(value):
+    """Map calamine cell values to what openpyxl returns"""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    # openpyxl returns datetime for date cells, calamine a plain date
+    if type(value) is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _row_has_value(row) -> bool:
+    """True if any cell holds a value other than None or blank text"""
+    for cell in row:
+        if cell is None:
+            continue
+        if not isinstance(cell, str) or (cell and not cell.isspace()):
+            return True
+    return False
 
 
 class SharePointAuth:
@@ -29,6 +116,7 @@ class SharePointAuth:
         self.sharepoint_site = sharepoint_site
         self.access_token = None
         self.token_expires_at = 0
+        self.session = _create_http_session()
 
     def get_access_token(self) -> str:
         """Get or refresh access token"""
@@ -37,6 +125,13 @@ class SharePointAuth:
                 time.time() < self.token_expires_at - 300):
             return self.access_token
 
+        # Reuse a token another client already obtained for the same app
+        cache_key = (self.tenant_id, self.client_id, self.sharepoint_site)
+        cached = _TOKEN_CACHE.get(cache_key)
+        if cached and time.time() < cached[1] - 300:
+            self.access_token, self.token_expires_at = cached
+            return self.access_token
+
         # Get new token
         token_url = (
             f"https://login.microsoftonline.com/"
@@ -51,13 +146,16 @@ class SharePointAuth:
         }
 
         try:
-            response = requests.post(token_url, data=token_data)
+            response = self.session.post(token_url, data=token_data)
             response.raise_for_status()
             token_response = response.json()
 
             self.access_token = token_response['access_token']
             expires_in = token_response.get('expires_in', 3600)
             self.token_expires_at = time.time() + expires_in
+            _TOKEN_CACHE[cache_key] = (
+                self.access_token, self.token_expires_at
+            )
 
             logging.info("Successfully obtained SharePoint access token")
             return self.access_token
@@ -70,6 +168,11 @@ class SharePointAuth:
 
 
 class ExcelClient:
+    # Bytes per read when streaming the workbook from SharePoint
+    download_chunk_size = 1024 * 1024
+    # Range-request resumes attempted when a download is cut off
+    download_retries = 3
+
     def __init__(self, file_path: str,
                  sharepoint_auth: Optional[SharePointAuth] = None):
         """
@@ -90,12 +193,23 @@ class ExcelClient:
             self.temp_file = None
             self.sharepoint_url = file_path
             self.file_path = None  # Will be set when we download
+            # Validators of the downloaded copy, sent back so an unchanged
+            # file is answered with 304 instead of being downloaded again
+            self._etag = None
+            self._last_modified = None
             self.sharepoint_auth = sharepoint_auth
 
             # Try to initialize auth from environment if not provided
             if not self.sharepoint_auth:
                 self.sharepoint_auth = self._init_auth_from_env()
 
+            # Reuse the auth session so token, download and upload share
+            # warm connections
+            self.http = (
+                self.sharepoint_auth.session if self.sharepoint_auth
+                else _create_http_session()
+            )
+
             if self.sharepoint_auth:
                 logging.info(
                     f"Initialized ExcelClient with SharePoint URL "
@@ -112,11 +226,15 @@ class ExcelClient:
             self.temp_file = None
             self.sharepoint_url = None
             self.sharepoint_auth = None
+            self.http = None
             logging.info(
                 f"Initialized ExcelClient with local path: {file_path}"
             )
 
         self.workbook = None
+        # File signature the open (writable) workbook was loaded/saved at
+        self._workbook_signature = None
+        self._finalizer = None
 
     def _init_auth_from_env(self) -> Optional[SharePointAuth]:
         """Initialize SharePoint auth from environment variables"""
@@ -148,47 +266,24 @@ class ExcelClient:
 
     def _convert_sharepoint_url_to_api(self, url: str) -> str:
         """Convert SharePoint web URL to REST API URL"""
-        # Parse the URL
-        parsed = urlparse(url)
-
-        # Extract site and file path
-        # URL format: https://tenant.sharepoint.com/sites/SiteName/...
-        path_parts = parsed.path.split('/')
-        site_index = None
-        for i, part in enumerate(path_parts):
-            if part == 'sites' and i + 1 < len(path_parts):
-                site_index = i
-                break
-
-        if site_index:
-            site_name = path_parts[site_index + 1]
-            # Get everything after /sites/SiteName/
-            file_path = '/'.join(path_parts[site_index + 2:])
-            # Remove query parameters from file path
-            file_path = file_path.split('?')[0]
-            # URL encode the path
-            file_path = '/'.join(
-                quote(part, safe='') for part in file_path.split('/')
-            )
-
-            api_url = (
-                f"{parsed.scheme}://{parsed.netloc}/sites/{site_name}/"
-                f"_api/web/GetFileByServerRelativeUrl('{file_path}')/$value"
-            )
-            return api_url
-        else:
-            # Fallback: try direct download URL
-            return url.split('?')[0] + '?download=1'
+        return _sharepoint_api_url(url)
 
     def _download_from_sharepoint(self) -> Path:
-        """Download file from SharePoint to temporary location"""
+        """
+        Download file from SharePoint to temporary location
+        Skips the transfer when the server reports our copy is current
+        """
         try:
-            # Create a temporary file
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.xlsx')
-            os.close(temp_fd)  # Close the file descriptor
-
             # Prepare headers
             headers = {}
+            has_local_copy = (
+                self.temp_file is not None and Path(self.temp_file).exists()
+            )
+            if has_local_copy:
+                if self._etag:
+                    headers['If-None-Match'] = self._etag
+                if self._last_modified:
+                    headers['If-Modified-Since'] = self._last_modified
             if self.sharepoint_auth:
                 # Use authenticated request
                 access_token = self.sharepoint_auth.get_access_token()
@@ -206,17 +301,46 @@ class ExcelClient:
                 )
 
             # Download the file
-            response = requests.get(
+            response = self.http.get(
                 download_url, headers=headers, stream=True
             )
+            if response.status_code == 304 and has_local_copy:
+                response.close()
+                logging.debug(
+                    f"SharePoint file not modified, reusing: {self.temp_file}"
+                )
+                return self.file_path
             response.raise_for_status()
 
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Drop validators first so a partial write is never reused on 304
+            self._etag = None
+            self._last_modified = None
+
+            if self.temp_file is None:
+                # First download - create the temp file once and write
+                # through its descriptor; later downloads overwrite it
+                temp_fd, temp_path = tempfile.mkstemp(suffix='.xlsx')
+                f = os.fdopen(temp_fd, 'wb')
+                # Removed when the client is closed or garbage collected
+                self._finalizer = weakref.finalize(
+                    self, _cleanup_tempfile, temp_path
+                )
+            else:
+                temp_path = self.temp_file
+                f = open(temp_path, 'wb')
 
             self.temp_file = temp_path
             self.file_path = Path(temp_path)
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            with f:
+                self._write_download(
+                    response, f, download_url, headers, etag or last_modified
+                )
+
+            self._etag = etag
+            self._last_modified = last_modified
             logging.info(
                 f"Downloaded SharePoint file to temp location: {temp_path}"
             )
@@ -244,6 +368,57 @@ class ExcelClient:
                 )
             raise
 
+    def _write_download(self, response, f, download_url: str,
+                        headers: Dict[str, str], validator: Optional[str]):
+        """
+        Write a download response to f, resuming with a Range request from
+        the bytes already written if the connection drops part way
+
+        Resuming needs a validator (ETag/Last-Modified) for If-Range, server
+        support for byte ranges and an uncompressed body, otherwise the
+        error is raised
+        """
+        # Range offsets count encoded bytes, so a gzip/deflate response (the
+        # Session offers both by default) cannot be resumed from f.tell()
+        can_resume = (
+            validator and response.headers.get('Accept-Ranges') == 'bytes'
+            and response.headers.get('Content-Encoding', 'identity')
+            == 'identity'
+        )
+        for attempt in range(self.download_retries + 1):
+            try:
+                for chunk in response.iter_content(
+                        chunk_size=self.download_chunk_size):
+                    f.write(chunk)
+                return
+            except (requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError) as e:
+                if not can_resume or attempt == self.download_retries:
+                    raise
+                written = f.tell()
+                delay = 2 ** attempt
+                logging.warning(
+                    f"SharePoint download interrupted after {written} bytes "
+                    f"({e}), resuming in {delay}s"
+                )
+                time.sleep(delay)
+
+                range_headers = {
+                    key: value for key, value in headers.items()
+                    if key not in ('If-None-Match', 'If-Modified-Since')
+                }
+                range_headers['Range'] = f'bytes={written}-'
+                range_headers['If-Range'] = validator
+                response = self.http.get(
+                    download_url, headers=range_headers, stream=True
+                )
+                response.raise_for_status()
+                if response.status_code != 206:
+                    # File changed on the server (If-Range did not match)
+                    # or ranges were ignored - start over from byte 0
+                    f.seek(0)
+                    f.truncate()
+
     def _upload_to_sharepoint(self, local_path: Path):
         """Upload file back to SharePoint"""
         if not self.sharepoint_auth:
@@ -268,15 +443,21 @@ class ExcelClient:
                 )
             }
 
-            # Read file and upload
+            # Stream the file instead of reading it into memory - the explicit
+            # Content-Length avoids chunked encoding, which some SharePoint
+            # endpoints reject
+            headers['Content-Length'] = str(os.path.getsize(local_path))
             with open(local_path, 'rb') as f:
-                file_content = f.read()
-
-            response = requests.put(
-                upload_url, data=file_content, headers=headers
-            )
+                response = self.http.put(
+                    upload_url, data=f, headers=headers
+                )
             response.raise_for_status()
 
+            # The local copy now matches the server - keep its new ETag if
+            # one was returned, otherwise force a full download next time
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+
             logging.info(
                 f"Uploaded file back to SharePoint: {self.sharepoint_url}"
             )
@@ -292,9 +473,31 @@ class ExcelClient:
             )
             raise
 
-    def _load_workbook(self, force_reload=True):
-        """Load workbook, create if doesn't exist - reloads fresh data"""
+    def _load_workbook(self, force_reload=True, read_only=False):
+        """
+        Load workbook, create if doesn't exist - reloads fresh data
+
+        Args:
+            force_reload: Close and reload an already open workbook
+            read_only: Open a streaming, values-only workbook for reads
+                (must not be used before modifying and saving)
+        """
         try:
+            # Handle SharePoint URLs - download, or confirm the local copy
+            # is still current (conditional GET)
+            if self.is_sharepoint_url:
+                self._download_from_sharepoint()
+
+            # Reuse the open workbook if the file is unchanged since it was
+            # loaded or saved - external edits change mtime/size and still
+            # trigger a fresh reload
+            signature = self._file_signature()
+            if (not read_only and self.workbook is not None and
+                    signature is not None and
+                    signature == self._workbook_signature):
+                logging.debug(f"Workbook unchanged, reusing: {self.file_path}")
+                return
+
             # Close existing workbook if open to ensure fresh reload
             if self.workbook is not None and force_reload:
                 try:
@@ -302,21 +505,18 @@ class ExcelClient:
                 except Exception:
                     pass
                 self.workbook = None
+            self._workbook_signature = None
 
-            # Handle SharePoint URLs
-            if self.is_sharepoint_url:
-                if (self.temp_file is None or
-                        not Path(self.temp_file).exists()):
-                    # Download from SharePoint
-                    self._download_from_sharepoint()
-                else:
-                    # Re-download to get latest changes
-                    self._download_from_sharepoint()
-
-            if self.file_path.exists():
-                # Always reload from disk to get latest changes
+            if signature is not None:
+                # Reload from disk to get latest changes
                 # This ensures any external edits are immediately visible
-                self.workbook = load_workbook(self.file_path)
+                if read_only:
+                    self.workbook = load_workbook(
+                        self.file_path, read_only=True, data_only=True
+                    )
+                else:
+                    self.workbook = load_workbook(self.file_path)
+                    self._workbook_signature = signature
                 logging.debug(f"Reloaded workbook from: {self.file_path}")
             else:
                 # Create new workbook if it doesn't exist
@@ -328,29 +528,50 @@ class ExcelClient:
             logging.error(f"Error loading workbook: {e}")
             raise
 
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the local file, None if it does not exist"""
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def _save_workbook(self):
         """Save workbook to file"""
         try:
             self.workbook.save(self.file_path)
+            # The open workbook now matches the file on disk
+            self._workbook_signature = self._file_signature()
             logging.debug(f"Workbook saved: {self.file_path}")
 
             # If it's a SharePoint URL, upload the changes back
             if self.is_sharepoint_url and self.temp_file:
                 self._upload_to_sharepoint(self.file_path)
         except Exception as e:
+            # In-memory changes may not be on disk - force the next reload
+            self._workbook_signature = None
             logging.error(f"Error saving workbook: {e}")
             raise
 
-    def __del__(self):
-        """Cleanup temporary file when object is destroyed"""
-        if self.temp_file and Path(self.temp_file).exists():
+    def close(self):
+        """Close the workbook and remove the SharePoint temp file now"""
+        if self.workbook is not None:
             try:
-                os.unlink(self.temp_file)
-                logging.debug(
-                    f"Cleaned up temporary file: {self.temp_file}"
-                )
-            except Exception as e:
-                logging.warning(f"Failed to cleanup temporary file: {e}")
+                self.workbook.close()
+            except Exception:
+                pass
+            self.workbook = None
+        self._workbook_signature = None
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self.temp_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def get_or_create_worksheet(
             self, worksheet_name: str, headers: List[str]):
@@ -359,46 +580,92 @@ class ExcelClient:
         # This ensures any external changes are immediately visible
         self._load_workbook()
 
-        if worksheet_name not in self.workbook.sheetnames:
-            worksheet = self.workbook.create_sheet(worksheet_name)
-            worksheet.append(headers)
+        worksheet, created = self._ensure_worksheet(worksheet_name, headers)
+        if created:
             self._save_workbook()
-            logging.info(f"Created worksheet: {worksheet_name}")
 
-        return self.workbook[worksheet_name]
+        return worksheet
+
+    def _ensure_worksheet(self, worksheet_name: str, headers: List[str]):
+        """
+        Get or create worksheet in the already loaded workbook (no reload,
+        no save) so callers can batch their changes into a single save
+
+        Returns:
+            (worksheet, created)
+        """
+        if worksheet_name in self.workbook.sheetnames:
+            return self.workbook[worksheet_name], False
+
+        worksheet = self.workbook.create_sheet(worksheet_name)
+        worksheet.append(headers)
+        logging.info(f"Created worksheet: {worksheet_name}")
+        return worksheet, True
 
     def get_worksheet_data(self, worksheet_name: str) -> List[Dict]:
         """Read all data from worksheet - reloads workbook each time"""
-        # Force reload workbook to get latest data from Excel file
-        # This ensures any external changes are immediately visible
-        self._load_workbook()
+        # Fast path: python-calamine (Rust) reads values much faster than
+        # openpyxl; openpyxl is still used for all writes
+        if CalamineWorkbook is not None:
+            if self.is_sharepoint_url:
+                # Make sure the local copy is current (conditional GET)
+                self._download_from_sharepoint()
+            if self.file_path.exists():
+                rows = self._read_rows_calamine(worksheet_name)
+                if rows is None:
+                    logging.warning(f"Worksheet '{worksheet_name}' not found")
+                    return []
+                return self._rows_to_records(iter(rows))
 
-        if worksheet_name not in self.workbook.sheetnames:
-            logging.warning(f"Worksheet '{worksheet_name}' not found")
-            return []
+        # Force reload workbook to get latest data from Excel file
+        # This ensures any external changes are immediately visible.
+        # Read-only mode streams values without building Cell objects
+        self._load_workbook(read_only=True)
 
-        worksheet = self.workbook[worksheet_name]
+        try:
+            if worksheet_name not in self.workbook.sheetnames:
+                logging.warning(f"Worksheet '{worksheet_name}' not found")
+                return []
 
+            return self._rows_to_records(
+                self.workbook[worksheet_name].iter_rows(values_only=True)
+            )
+        finally:
+            # Read-only workbooks keep the file open until closed
+            self.workbook.close()
+            self.workbook = None
+
+    def _read_rows_calamine(self, worksheet_name: str) -> Optional[List[tuple]]:
+        """Read raw rows with python-calamine, None if the worksheet does not exist"""
+        workbook = CalamineWorkbook.from_path(str(self.file_path))
+        if worksheet_name not in workbook.sheet_names:
+            return None
+        rows = workbook.get_sheet_by_name(worksheet_name).to_python()
+        normalize = _normalize_calamine_value
+        return [tuple(normalize(value) for value in row) for row in rows]
+
+    @staticmethod
+    def _rows_to_records(rows: Iterator[tuple]) -> List[Dict]:
+        """Turn raw rows (header row first) into one dict per non-empty row"""
         # Get headers from first row
-        headers = []
-        if worksheet.max_row > 0:
-            for cell in worksheet[1]:
-                headers.append(cell.value if cell.value else "")
+        headers = tuple(
+            value if value else "" for value in next(rows, None) or ()
+        )
 
         if not headers:
             return []
 
         # Get data rows
+        width = len(headers)
         records = []
-        for row in worksheet.iter_rows(min_row=2, values_only=True):
+        for row in rows:
             # Skip completely empty rows
-            if any(cell is not None and str(cell).strip()
-                   for cell in row if cell is not None):
-                record = {}
-                for i, header in enumerate(headers):
-                    value = row[i] if i < len(row) else None
-                    record[header] = value
-                records.append(record)
+            if not _row_has_value(row):
+                continue
+            # Read-only sheets may return short rows - pad with None
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            records.append(dict(zip(headers, row)))
 
         return records
 
@@ -415,7 +682,9 @@ class ExcelClient:
         # Reload workbook to ensure we have latest data before appending
         self._load_workbook()
 
-        worksheet = self.get_or_create_worksheet(worksheet_name, [])
+        # No second reload/save via get_or_create_worksheet - a new sheet is
+        # saved together with the row below
+        worksheet, _ = self._ensure_worksheet(worksheet_name, [])
 
         # Append row - openpyxl automatically finds the next free row
         worksheet.append(row_data)
@@ -440,8 +709,9 @@ class ExcelClient:
         # Reload workbook to ensure we have latest data
         self._load_workbook()
 
-        # Get or create worksheet with headers
-        worksheet = self.get_or_create_worksheet(worksheet_name, headers)
+        # Get or create worksheet with headers - saved together with the
+        # new rows below, so this is one load and one save/upload
+        worksheet, _ = self._ensure_worksheet(worksheet_name, headers)
 
         # Clear all existing data rows (keep header row)
         if worksheet.max_row > 1:
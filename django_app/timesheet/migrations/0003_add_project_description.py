@@ -3,27 +3,46 @@
 from django.db import migrations, models
 
 
+BATCH_SIZE = 500
+
+
 def split_project_names(apps, schema_editor):
     """Split existing project names to extract project_description"""
     Project = apps.get_model('timesheet', 'Project')
     
-    for project in Project.objects.all():
-        if ' - ' in project.name:
-            parts = project.name.split(' - ', 1)
-            project.name = parts[0].strip()
-            project.project_description = parts[1].strip() if len(parts) > 1 else None
-            project.save()
+    to_update = []
+    projects = Project.objects.filter(name__contains=' - ').only(
+        'id', 'name', 'project_description'
+    )
+    for project in projects.iterator(chunk_size=1000):
+        parts = project.name.split(' - ', 1)
+        project.name = parts[0].strip()
+        project.project_description = parts[1].strip() if len(parts) > 1 else None
+        to_update.append(project)
+        if len(to_update) >= BATCH_SIZE:
+            Project.objects.bulk_update(to_update, ['name', 'project_description'])
+            to_update.clear()
+    if to_update:
+        Project.objects.bulk_update(to_update, ['name', 'project_description'])
 
 
 def reverse_split_project_names(apps, schema_editor):
     """Reverse: combine project_description back into name"""
     Project = apps.get_model('timesheet', 'Project')
     
-    for project in Project.objects.all():
-        if project.project_description:
-            project.name = f"{project.name} - {project.project_description}"
-            project.project_description = None
-            project.save()
+    to_update = []
+    projects = Project.objects.exclude(project_description__isnull=True).exclude(
+        project_description=''
+    ).only('id', 'name', 'project_description')
+    for project in projects.iterator(chunk_size=1000):
+        project.name = f"{project.name} - {project.project_description}"
+        project.project_description = None
+        to_update.append(project)
+        if len(to_update) >= BATCH_SIZE:
+            Project.objects.bulk_update(to_update, ['name', 'project_description'])
+            to_update.clear()
+    if to_update:
+        Project.objects.bulk_update(to_update, ['name', 'project_description'])
 
 
 class Migration(migrations.Migration):
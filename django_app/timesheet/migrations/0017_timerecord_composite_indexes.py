@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0016_add_inventory_scan'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timerecord',
+            name='time_record_employe_7c82df_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timerecord',
+            index=models.Index(fields=['employee_id', 'start_time'], name='time_record_employe_bdbd03_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timerecord',
+            index=models.Index(fields=['employee_id', '-end_time'], name='time_record_employe_180f8e_idx'),
+        ),
+    ]
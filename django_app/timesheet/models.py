@@ -1,10 +1,27 @@
 from django.db import models
 from django.utils import timezone
+import os
+import time
 import uuid
 
 
+def _uuid7():
+    """UUID version 7: 48-bit Unix ms timestamp followed by random bits"""
+    unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & ((1 << 48) - 1)) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Set version (7) and RFC 4122 variant bits
+    value = value & ~(0xF << 76) | (0x7 << 76)
+    value = value & ~(0x3 << 62) | (0x2 << 62)
+    return uuid.UUID(int=value)
+
+
+uuid7 = getattr(uuid, 'uuid7', _uuid7)  # stdlib from Python 3.14
+
+
 def generate_uuid():
-    return str(uuid.uuid4())
+    # Time-ordered ids, so new rows are appended at the end of the primary
+    # key index instead of landing on random pages like uuid4
+    return str(uuid7())
 
 class ActiveTimer(models.Model):
     """Currently running timers"""
@@ -45,7 +62,9 @@ class TimeRecord(models.Model):
     class Meta:
         db_table = 'time_records'
         indexes = [
-            models.Index(fields=['employee_id']),
+            # Composite indexes also serve employee_id-only lookups
+            models.Index(fields=['employee_id', 'start_time']),
+            models.Index(fields=['employee_id', '-end_time']),
             models.Index(fields=['start_time']),
         ]
         ordering = ['-end_time']
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
@@ -25,20 +27,23 @@ def in_set(value, collection):
     return value in collection
 
 
+@lru_cache(maxsize=1024)
+def _format_duration(seconds):
+    """Build the duration label once per distinct number of seconds"""
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, remaining_seconds = divmod(seconds, 60)
+    if remaining_seconds == 0:
+        return f"{minutes}min"
+    return f"{minutes}min {remaining_seconds}s"
+
+
 @register.filter
 def format_duration_seconds(seconds):
     """Format duration in seconds to readable format"""
     if not seconds:
         return "0s"
     try:
-        seconds = int(seconds)
-        if seconds < 60:
-            return f"{seconds}s"
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
-        if remaining_seconds == 0:
-            return f"{minutes}min"
-        return f"{minutes}min {remaining_seconds}s"
+        return _format_duration(int(seconds))
     except (ValueError, TypeError):
         return "0s"
-
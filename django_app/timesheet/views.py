@@ -4,11 +4,13 @@ from django.utils import timezone
 from django.conf import settings
 from datetime import timedelta, datetime
 import logging
-import uuid
 import os
 import re
-from functools import wraps
-import pytz
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import json
 from urllib.parse import quote
 from .models import (
@@ -33,16 +35,31 @@ from .view_utils import get_non_prod_base_payload, get_prod_base_payload
 logger = logging.getLogger(__name__)
 
 
+IFS_ACTIVITY_MAPPING_FILE = os.path.join(
+    os.path.dirname(__file__),
+    'ifs_activity_mapping.json',
+)
+
+# Parsed mapping kept in memory, keyed by the file's (mtime, size) so edits
+# made by another worker or by hand are picked up on the next request
+_ifs_activity_mapping_cache = {'signature': None, 'data': {}}
+
+
 def load_ifs_activity_mapping():
-    """Load static mapping for IFS report cost codes to UI activity groups."""
-    mapping_file = os.path.join(
-        os.path.dirname(__file__),
-        'ifs_activity_mapping.json',
-    )
+    """Load static mapping for IFS report cost codes to UI activity groups.
+
+    The returned dict is shared between requests and must not be modified.
+    """
     try:
-        with open(mapping_file, 'r', encoding='utf-8') as f:
+        stat = os.stat(IFS_ACTIVITY_MAPPING_FILE)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == _ifs_activity_mapping_cache['signature']:
+            return _ifs_activity_mapping_cache['data']
+        with open(IFS_ACTIVITY_MAPPING_FILE, 'r', encoding='utf-8') as f:
             data = json.load(f)
         if isinstance(data, dict):
+            _ifs_activity_mapping_cache['data'] = data
+            _ifs_activity_mapping_cache['signature'] = signature
             return data
     except Exception as exc:
         logger.warning("Failed to load IFS activity mapping JSON: %s", exc)
@@ -51,19 +68,37 @@ def load_ifs_activity_mapping():
 
 def save_ifs_activity_mapping(mapping_data):
     """Persist IFS activity mapping JSON to disk."""
-    mapping_file = os.path.join(
-        os.path.dirname(__file__),
-        'ifs_activity_mapping.json',
-    )
-    with open(mapping_file, 'w', encoding='utf-8') as f:
+    with open(IFS_ACTIVITY_MAPPING_FILE, 'w', encoding='utf-8') as f:
         json.dump(mapping_data, f, ensure_ascii=False, indent=2)
+    _ifs_activity_mapping_cache['signature'] = None
+
+
+# Common Windows timezone names mapped to IANA zones (used for EXCEL_TIMEZONE=system)
+WINDOWS_TIMEZONE_MAPPING = MappingProxyType({
+    'Central European Standard Time': 'Europe/Prague',
+    'Central European Time': 'Europe/Prague',
+    'Central Europe Standard Time': 'Europe/Prague',
+    'Central Europe Daylight Time': 'Europe/Prague',
+    'W. Europe Standard Time': 'Europe/Berlin',
+    'Romance Standard Time': 'Europe/Paris',
+    'GMT Standard Time': 'Europe/London',
+    'Eastern Standard Time': 'America/New_York',
+})
 
 
+@lru_cache(maxsize=1)
+def get_django_timezone():
+    """Django's TIME_ZONE as a tzinfo, resolved once per process."""
+    return ZoneInfo(settings.TIME_ZONE)
+
+
+@lru_cache(maxsize=1)
 def get_excel_timezone():
     """
     Get the timezone to use for Excel exports.
     Returns system local timezone if EXCEL_TIMEZONE is 'system',
     otherwise uses the configured timezone.
+    Resolved once per process - the settings do not change at runtime.
     """
     excel_tz = getattr(settings, 'EXCEL_TIMEZONE', settings.TIME_ZONE)
     
@@ -72,41 +107,30 @@ def get_excel_timezone():
         # Get local timezone from system
         from datetime import datetime, timezone as dt_timezone
         local_tz = datetime.now(dt_timezone.utc).astimezone().tzinfo
-        # Convert to pytz timezone if needed
-        if isinstance(local_tz, pytz.BaseTzInfo):
+        # Already an IANA zone - use it as is
+        if isinstance(local_tz, ZoneInfo):
             return local_tz
         else:
             # Try to get timezone name and convert
             tz_name = str(local_tz)
-            # Common Windows timezone mappings
-            tz_mapping = {
-                'Central European Standard Time': 'Europe/Prague',
-                'Central European Time': 'Europe/Prague',
-                'Central Europe Standard Time': 'Europe/Prague',
-                'Central Europe Daylight Time': 'Europe/Prague',
-                'W. Europe Standard Time': 'Europe/Berlin',
-                'Romance Standard Time': 'Europe/Paris',
-                'GMT Standard Time': 'Europe/London',
-                'Eastern Standard Time': 'America/New_York',
-            }
-            mapped_tz = tz_mapping.get(tz_name)
+            mapped_tz = WINDOWS_TIMEZONE_MAPPING.get(tz_name)
             if mapped_tz:
-                return pytz.timezone(mapped_tz)
+                return ZoneInfo(mapped_tz)
             # Default to Django TIME_ZONE if can't determine
             logger.warning(
                 f"Could not determine system timezone '{tz_name}', "
                 f"using Django TIME_ZONE"
             )
-            return pytz.timezone(settings.TIME_ZONE)
+            return get_django_timezone()
     else:
         # Use configured timezone
         try:
-            return pytz.timezone(excel_tz)
-        except pytz.exceptions.UnknownTimeZoneError:
+            return ZoneInfo(excel_tz)
+        except (ZoneInfoNotFoundError, ValueError):
             logger.warning(
                 f"Unknown timezone '{excel_tz}', using Django TIME_ZONE"
             )
-            return pytz.timezone(settings.TIME_ZONE)
+            return get_django_timezone()
 
 
 def convert_to_excel_timezone(dt):
@@ -116,7 +140,7 @@ def convert_to_excel_timezone(dt):
     """
     if timezone.is_naive(dt):
         # Make naive datetime timezone-aware using Django's TIME_ZONE
-        dt = timezone.make_aware(dt, pytz.timezone(settings.TIME_ZONE))
+        dt = timezone.make_aware(dt, get_django_timezone())
     
     # Convert to Excel timezone
     excel_tz = get_excel_timezone()
@@ -133,10 +157,11 @@ def admin_required(view_func):
     @django_login_required
     def wrapper(request, *args, **kwargs):
         # Check if user has admin access (Admin group, staff, or superuser)
+        # Flags on the already-loaded user first, so staff skip the group query
         has_admin_access = (
-            request.user.groups.filter(name='Admin').exists() or
             request.user.is_staff or
-            request.user.is_superuser
+            request.user.is_superuser or
+            request.user.groups.filter(name='Admin').exists()
         )
         
         if has_admin_access:
@@ -169,22 +194,23 @@ def get_week_start():
     return start.replace(hour=0, minute=0, second=0, microsecond=0)
 
 
+@lru_cache(maxsize=1024)
 def format_duration(seconds):
     """Format seconds to human readable duration"""
     if not seconds:
         return '0min'
-    hrs = seconds // 3600
-    mins = (seconds % 3600) // 60
+    hrs, rest = divmod(seconds, 3600)
+    mins = rest // 60
     if hrs > 0:
         return f"{hrs}h {mins}min"
     return f"{mins}min"
 
 
+@lru_cache(maxsize=1024)
 def format_time(seconds):
     """Format seconds to HH:MM:SS"""
-    hrs = seconds // 3600
-    mins = (seconds % 3600) // 60
-    secs = seconds % 60
+    mins, secs = divmod(seconds, 60)
+    hrs, mins = divmod(mins, 60)
     return f"{hrs:02d}:{mins:02d}:{secs:02d}"
 
 
@@ -248,26 +274,21 @@ def employee_selection(request):
     
     # Get active timers
     try:
-        timers = ActiveTimer.objects.all()
-        for timer in timers:
-            active_timers[timer.employee_id] = {
-                'id': timer.id,
-                'employee_id': timer.employee_id,
-                'employee_name': timer.employee_name,
-                'project_id': timer.project_id,
-                'project_name': timer.project_name,
-                'task': timer.task,
-                'is_non_productive': timer.is_non_productive,
-                'is_break': timer.is_break,
-                'start_time': timer.start_time.isoformat(),
-            }
+        # Plain dict rows - no model instances needed for the template lookup
+        active_timers = {
+            timer['employee_id']: {**timer, 'start_time': timer['start_time'].isoformat()}
+            for timer in ActiveTimer.objects.values(
+                'id', 'employee_id', 'employee_name', 'project_id', 'project_name',
+                'task', 'is_non_productive', 'is_break', 'start_time',
+            )
+        }
     except Exception as e:
         logger.error(f"Error fetching active timers: {e}", exc_info=True)
     
     is_admin = (
-        request.user.groups.filter(name='Admin').exists() or
         request.user.is_staff or
-        request.user.is_superuser
+        request.user.is_superuser or
+        request.user.groups.filter(name='Admin').exists()
     )
     
     return render(request, 'timesheet/employee_selection.html', {
@@ -379,20 +400,32 @@ def timer_page(request, employee_id):
     today_start = get_today_start()
     week_start = get_week_start()
     
-    today_records = TimeRecord.objects.filter(
+    # Totals are summed by the database; only the short list shown on the page is loaded
+    summary_totals = {
+        'productive': Sum('duration_seconds', filter=Q(is_non_productive=False)),
+        'non_productive': Sum('duration_seconds', filter=Q(is_non_productive=True)),
+    }
+    today_totals = TimeRecord.objects.filter(
         employee_id=employee_id,
         end_time__gte=today_start
-    ).order_by('-end_time')[:100]
+    ).aggregate(**summary_totals)
     
-    week_records = TimeRecord.objects.filter(
+    week_totals = TimeRecord.objects.filter(
         employee_id=employee_id,
         end_time__gte=week_start
-    ).order_by('-end_time')[:500]
+    ).aggregate(**summary_totals)
+    
+    today_display = TimeRecord.objects.filter(
+        employee_id=employee_id,
+        end_time__gte=today_start
+    ).order_by('-end_time').only(
+        'id', 'task', 'project_name', 'is_non_productive', 'duration_seconds'
+    )[:10]
     
-    today_prod = sum(r.duration_seconds or 0 for r in today_records if not r.is_non_productive)
-    today_nonprod = sum(r.duration_seconds or 0 for r in today_records if r.is_non_productive)
-    week_prod = sum(r.duration_seconds or 0 for r in week_records if not r.is_non_productive)
-    week_nonprod = sum(r.duration_seconds or 0 for r in week_records if r.is_non_productive)
+    today_prod = today_totals['productive'] or 0
+    today_nonprod = today_totals['non_productive'] or 0
+    week_prod = week_totals['productive'] or 0
+    week_nonprod = week_totals['non_productive'] or 0
     
     summary = {
         'today': {
@@ -408,7 +441,7 @@ def timer_page(request, employee_id):
                     'is_non_productive': r.is_non_productive,
                     'duration_seconds': r.duration_seconds,
                 }
-                for r in today_records[:10]
+                for r in today_display
             ]
         },
         'week': {
@@ -487,7 +520,6 @@ def start_timer(request, employee_id):
         
         start_time = timezone.now()
         record = ActiveTimer(
-            id=str(uuid.uuid4()),
             employee_id=employee_id,
             employee_name=employee['name'],
             project_id=project_id,
@@ -505,6 +537,23 @@ def start_timer(request, employee_id):
         return redirect('timer_page', employee_id=employee_id)
 
 
+# Single worker so Excel appends from stopped timers are written one at a time
+_excel_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='excel-export')
+# Held while the workbook is written, so a sync never interleaves with a pending append
+_excel_write_lock = threading.Lock()
+
+
+def append_record_to_excel(excel_client, sheet_name, headers, row):
+    """Append one time record row to the Excel sheet (runs on the export thread)"""
+    try:
+        with _excel_write_lock:
+            excel_client.get_or_create_worksheet(sheet_name, headers)
+            excel_client.append_row(sheet_name, row)
+        logger.info(f"✓ Exported to Excel: {sheet_name}")
+    except Exception as excel_error:
+        logger.error(f"⚠ Error exporting to Excel (record already saved to DB): {excel_error}")
+
+
 @login_required
 def stop_timer(request, employee_id):
     """Stop a timer and save to database, then Excel - handles form submission"""
@@ -512,52 +561,55 @@ def stop_timer(request, employee_id):
         return redirect('timer_page', employee_id=employee_id)
     
     try:
-        # Get active timer
-        timer = get_object_or_404(ActiveTimer, employee_id=employee_id)
-        
-        # Use timezone-aware datetime for accurate calculation
-        end_time = timezone.now()
-        
-        # Ensure both times are timezone-aware for accurate calculation
-        if timezone.is_naive(timer.start_time):
-            start_time = timezone.make_aware(timer.start_time)
-        else:
-            start_time = timer.start_time
-        
-        # Calculate duration accurately
-        time_delta = end_time - start_time
-        duration_seconds = int(time_delta.total_seconds())
-        
-        # Validate duration (should be positive)
-        if duration_seconds < 0:
-            logger.warning(f"Negative duration detected for timer {timer.id}, using 0")
-            duration_seconds = 0
-        
-        # Format duration
-        hours = duration_seconds // 3600
-        minutes = (duration_seconds % 3600) // 60
-        seconds = duration_seconds % 60
-        duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        
-        # Save to database FIRST (this is the source of truth)
-        # Database is primary storage - ensures data is never lost
-        time_record = TimeRecord(
-            id=timer.id,
-            employee_id=timer.employee_id,
-            employee_name=timer.employee_name,
-            project_id=timer.project_id,
-            project_name=timer.project_name,
-            task=timer.task,
-            is_non_productive=timer.is_non_productive,
-            start_time=start_time,  # Use timezone-aware start_time
-            end_time=end_time,
-            duration_seconds=duration_seconds,
-        )
-        time_record.save()
-        logger.info(f"✓ Saved time record to database: {timer.employee_name} - {duration_seconds}s ({duration_formatted})")
+        # Move the timer to time records in one transaction
+        with transaction.atomic():
+            # Get active timer, locked so a second stop request waits and then finds it gone
+            timer = get_object_or_404(ActiveTimer.objects.select_for_update(), employee_id=employee_id)
+            
+            # Use timezone-aware datetime for accurate calculation
+            end_time = timezone.now()
+            
+            # Ensure both times are timezone-aware for accurate calculation
+            if timezone.is_naive(timer.start_time):
+                start_time = timezone.make_aware(timer.start_time)
+            else:
+                start_time = timer.start_time
+            
+            # Calculate duration accurately
+            time_delta = end_time - start_time
+            duration_seconds = int(time_delta.total_seconds())
+            
+            # Validate duration (should be positive)
+            if duration_seconds < 0:
+                logger.warning(f"Negative duration detected for timer {timer.id}, using 0")
+                duration_seconds = 0
+            
+            # Format duration
+            duration_formatted = format_time(duration_seconds)
+            
+            # Save to database FIRST (this is the source of truth)
+            # Database is primary storage - ensures data is never lost
+            time_record = TimeRecord(
+                id=timer.id,
+                employee_id=timer.employee_id,
+                employee_name=timer.employee_name,
+                project_id=timer.project_id,
+                project_name=timer.project_name,
+                task=timer.task,
+                is_non_productive=timer.is_non_productive,
+                start_time=start_time,  # Use timezone-aware start_time
+                end_time=end_time,
+                duration_seconds=duration_seconds,
+            )
+            time_record.save()
+            
+            # Delete active timer in the same transaction as the record insert
+            timer.delete()
+            logger.info(f"✓ Saved time record to database: {timer.employee_name} - {duration_seconds}s ({duration_formatted})")
         
         # Then save to Excel (for reporting/export)
-        # Excel is secondary storage - if this fails, data is still safe in database
+        # Excel is secondary storage - if this fails, data is still safe in database.
+        # The workbook rewrite runs on the export thread so the response does not wait for it.
         excel_client = get_excel_client()
         if excel_client:
             try:
@@ -569,10 +621,11 @@ def stop_timer(request, employee_id):
                 duration_hours = round(duration_seconds / 3600.0, 2)
                 
                 if timer.is_non_productive:
-                    excel_client.get_or_create_worksheet("Neproduktivní záznamy", [
+                    sheet_name = "Neproduktivní záznamy"
+                    headers = [
                         "Datum", "Zaměstnanec ID", "Zaměstnanec", "Úkon",
                         "Začátek", "Konec", "Doba trvání", "Doba (hodiny)"
-                    ])
+                    ]
                     row = [
                         start_dt_excel.strftime("%Y-%m-%d"),
                         timer.employee_id,
@@ -583,13 +636,12 @@ def stop_timer(request, employee_id):
                         duration_formatted,
                         duration_hours
                     ]
-                    excel_client.append_row("Neproduktivní záznamy", row)
-                    logger.info(f"✓ Exported to Excel: Neproduktivní záznamy")
                 else:
-                    excel_client.get_or_create_worksheet("Záznamy", [
+                    sheet_name = "Záznamy"
+                    headers = [
                         "Datum", "Zaměstnanec ID", "Zaměstnanec", "Projekt ID", "Projekt",
                         "Úkon", "Začátek", "Konec", "Doba trvání", "Doba (hodiny)"
-                    ])
+                    ]
                     row = [
                         start_dt_excel.strftime("%Y-%m-%d"),
                         timer.employee_id,
@@ -602,21 +654,26 @@ def stop_timer(request, employee_id):
                         duration_formatted,
                         duration_hours
                     ]
-                    excel_client.append_row("Záznamy", row)
-                    logger.info(f"✓ Exported to Excel: Záznamy")
+                _excel_export_executor.submit(append_record_to_excel, excel_client, sheet_name, headers, row)
             except Exception as excel_error:
                 logger.error(f"⚠ Error exporting to Excel (record already saved to DB): {excel_error}")
                 # Don't fail if Excel export fails - data is already in database
         
-        # Delete active timer
-        timer.delete()
-        
         return redirect('timer_page', employee_id=employee_id)
     except Exception as e:
         logger.error(f"Error stopping timer: {e}")
         return redirect('timer_page', employee_id=employee_id)
 
 
+# Active timers running longer than this are flagged on the admin dashboard
+LONG_RUNNING_TIMER_SECONDS = 4 * 3600
+
+# Columns of this month's records used by the admin dashboard statistics
+DASHBOARD_MONTH_RECORD_FIELDS = (
+    'employee_id', 'project_id', 'project_name', 'task', 'is_non_productive', 'duration_seconds',
+)
+
+
 @admin_required
 def admin_dashboard(request):
     """Admin dashboard"""
@@ -640,12 +697,36 @@ def admin_dashboard(request):
     week_start = get_week_start()
     now = timezone.now()
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_totals = {}
     
     try:
-        active_timers = list(ActiveTimer.objects.all())
-        today_records = list(TimeRecord.objects.filter(end_time__gte=today_start)[:1000])
-        week_records = list(TimeRecord.objects.filter(end_time__gte=week_start)[:5000])
-        month_records_for_stats = list(TimeRecord.objects.filter(end_time__gte=month_start)[:10000])
+        active_timers = list(ActiveTimer.objects.only(
+            'employee_id', 'employee_name', 'project_name', 'task', 'is_non_productive', 'start_time'
+        ))
+        # Today/week totals per employee, grouped by the database
+        today_totals = dict(
+            TimeRecord.objects.filter(end_time__gte=today_start)
+            .values_list('employee_id')
+            .annotate(total=Sum('duration_seconds'))
+        )
+        week_totals = dict(
+            TimeRecord.objects.filter(end_time__gte=week_start)
+            .values_list('employee_id')
+            .annotate(total=Sum('duration_seconds'))
+        )
+        # Only the columns the statistics below read - the name columns are not needed here
+        month_records_for_stats = list(TimeRecord.objects.filter(end_time__gte=month_start).only(
+            *DASHBOARD_MONTH_RECORD_FIELDS
+        )[:10000])
+        # Month totals per employee, summed by the database
+        month_totals = {
+            row['employee_id']: row
+            for row in TimeRecord.objects.filter(end_time__gte=month_start).values('employee_id').annotate(
+                total_seconds=Sum('duration_seconds'),
+                productive_seconds=Sum('duration_seconds', filter=Q(is_non_productive=False)),
+                non_productive_seconds=Sum('duration_seconds', filter=Q(is_non_productive=True)),
+            )
+        }
         
         employee_stats = []
         active_map = {}
@@ -659,13 +740,9 @@ def admin_dashboard(request):
             emp_id = emp.get('id')
             if not emp_id:
                 continue
-            emp_today = [r for r in today_records if r and r.employee_id == emp_id]
-            emp_week = [r for r in week_records if r and r.employee_id == emp_id]
-            emp_month = [r for r in month_records_for_stats if r and r.employee_id == emp_id]
-            
-            today_secs = sum((r.duration_seconds or 0) for r in emp_today)
-            week_secs = sum((r.duration_seconds or 0) for r in emp_week)
-            month_secs = sum((r.duration_seconds or 0) for r in emp_month)
+            today_secs = today_totals.get(emp_id) or 0
+            week_secs = week_totals.get(emp_id) or 0
+            month_secs = (month_totals.get(emp_id) or {}).get('total_seconds') or 0
             
             active = active_map.get(emp_id)
             
@@ -708,7 +785,9 @@ def admin_dashboard(request):
         if 'month_records_for_stats' in locals():
             month_records = month_records_for_stats
         else:
-            month_records = list(TimeRecord.objects.filter(end_time__gte=month_start)[:10000])
+            month_records = list(TimeRecord.objects.filter(end_time__gte=month_start).only(
+                *DASHBOARD_MONTH_RECORD_FIELDS
+            )[:10000])
     except Exception as e:
         logger.error(f"Error fetching month records: {e}", exc_info=True)
         month_records = []
@@ -718,10 +797,10 @@ def admin_dashboard(request):
     if employee_stats:
         for emp in employee_stats:
             if emp and isinstance(emp, dict) and 'employee_id' in emp:
-                emp_month = [r for r in month_records if r.employee_id == emp.get('employee_id')]
-                month_secs = sum(r.duration_seconds or 0 for r in emp_month)
-                prod_secs = sum(r.duration_seconds or 0 for r in emp_month if not r.is_non_productive)
-                nonprod_secs = sum(r.duration_seconds or 0 for r in emp_month if r.is_non_productive)
+                emp_totals = month_totals.get(emp.get('employee_id')) or {}
+                month_secs = emp_totals.get('total_seconds') or 0
+                prod_secs = emp_totals.get('productive_seconds') or 0
+                nonprod_secs = emp_totals.get('non_productive_seconds') or 0
                 
                 stats_per_person.append({
                     'name': emp.get('employee_name', 'Unknown'),
@@ -739,13 +818,19 @@ def admin_dashboard(request):
     bom_to_project_map = {}
     
     try:
+        # Load every project referenced this month in one query instead of one per project
+        projects_by_id = Project.objects.only('id', 'name', 'project_description').in_bulk({
+            record.project_id for record in month_records
+            if record and record.project_id and not record.is_non_productive
+        })
+        
         for record in month_records:
             if record and record.project_id and not record.is_non_productive:
                 project_id = record.project_id
                 
                 if project_id not in project_cache:
-                    try:
-                        project = Project.objects.get(id=project_id)
+                    project = projects_by_id.get(project_id)
+                    if project is not None:
                         project_desc = project.project_description or None
                         project_cache[project_id] = {
                             'id': project.id,
@@ -753,7 +838,7 @@ def admin_dashboard(request):
                             'description': project_desc
                         }
                         bom_to_project_map[project_id] = project_desc
-                    except Project.DoesNotExist:
+                    else:
                         project_cache[project_id] = {
                             'id': project_id,
                             'name': project_id,
@@ -840,13 +925,17 @@ def admin_dashboard(request):
         for i in range(7):
             day_start = current_week_start + timedelta(days=i)
             day_end = day_start + timedelta(days=1)
-            day_records = TimeRecord.objects.filter(
+            day_totals = TimeRecord.objects.filter(
                 end_time__gte=day_start,
                 end_time__lt=day_end
+            ).aggregate(
+                total=Sum('duration_seconds'),
+                productive=Sum('duration_seconds', filter=Q(is_non_productive=False)),
+                non_productive=Sum('duration_seconds', filter=Q(is_non_productive=True)),
             )
-            day_total = sum((r.duration_seconds or 0) for r in day_records) / 3600
-            day_prod = sum((r.duration_seconds or 0) for r in day_records if not r.is_non_productive) / 3600
-            day_nonprod = sum((r.duration_seconds or 0) for r in day_records if r.is_non_productive) / 3600
+            day_total = (day_totals['total'] or 0) / 3600
+            day_prod = (day_totals['productive'] or 0) / 3600
+            day_nonprod = (day_totals['non_productive'] or 0) / 3600
             
             # Get day name (Mon, Tue, Wed, etc.)
             day_name = day_start.strftime('%a')
@@ -886,8 +975,8 @@ def admin_dashboard(request):
     
     # Productivity vs Non-productive (month)
     try:
-        month_prod = sum((r.duration_seconds or 0) for r in month_records if r and not r.is_non_productive) / 3600
-        month_nonprod = sum((r.duration_seconds or 0) for r in month_records if r and r.is_non_productive) / 3600
+        month_prod = sum((t.get('productive_seconds') or 0) for t in month_totals.values()) / 3600
+        month_nonprod = sum((t.get('non_productive_seconds') or 0) for t in month_totals.values()) / 3600
     except Exception as e:
         logger.error(f"Error calculating productivity stats: {e}", exc_info=True)
         month_prod = 0
@@ -896,16 +985,19 @@ def admin_dashboard(request):
     # Alerts for long running timers (> 4 hours)
     alerts = []
     try:
+        # Reuse the request's `now` instead of calling timezone.now() per timer
         for timer in active_timers:
             if timer and hasattr(timer, 'start_time') and timer.start_time:
-                elapsed = (timezone.now() - timer.start_time).total_seconds()
-                if elapsed > 4 * 3600:
+                elapsed = (now - timer.start_time).total_seconds()
+                if elapsed > LONG_RUNNING_TIMER_SECONDS:
+                    elapsed_hours = round(elapsed / 3600, 1)
+                    employee_name = getattr(timer, 'employee_name', 'Unknown')
                     alerts.append({
                         'type': 'long_running',
-                        'employee_name': getattr(timer, 'employee_name', 'Unknown'),
+                        'employee_name': employee_name,
                         'task': getattr(timer, 'task', 'Unknown'),
-                        'hours': round(elapsed / 3600, 1),
-                        'message': f"{getattr(timer, 'employee_name', 'Unknown')} pracuje už {round(elapsed/3600, 1)} hodin"
+                        'hours': elapsed_hours,
+                        'message': f"{employee_name} pracuje už {elapsed_hours} hodin"
                     })
     except Exception as e:
         logger.error(f"Error calculating alerts: {e}", exc_info=True)
@@ -974,11 +1066,14 @@ def parse_excel_datetime(date_str, time_str):
         # Make timezone-aware using Excel timezone
         excel_tz = get_excel_timezone()
         if timezone.is_naive(dt):
-            dt = excel_tz.localize(dt)
+            dt = dt.replace(tzinfo=excel_tz)
+            # In the repeated autumn DST hour take standard time (fold=1), as pytz
+            # localize() did with its default is_dst=False; zoneinfo's fold=0 would pick DST
+            if dt.utcoffset() > dt.replace(fold=1).utcoffset():
+                dt = dt.replace(fold=1)
         
         # Convert to Django timezone
-        django_tz = pytz.timezone(settings.TIME_ZONE)
-        dt = dt.astimezone(django_tz)
+        dt = dt.astimezone(get_django_timezone())
         
         return dt
     except Exception as e:
@@ -1027,6 +1122,11 @@ def sync_timesheet_data():
         updated_count = 0
         inserted_count = 0
         added_to_excel = 0
+        # DB writes are collected here and done in bulk once both sheets are read.
+        # New records are keyed like the lookup below so a duplicate Excel row
+        # updates the pending record instead of inserting a second one
+        records_to_create = {}
+        records_to_update = {}
         
         # Read productive records from Excel and upsert to database
         try:
@@ -1088,22 +1188,27 @@ def sync_timesheet_data():
                         is_non_productive=False
                     )
                     
-                    if matching_records.exists():
+                    pending_record = records_to_create.get(
+                        (employee_id, start_minute, task, False)
+                    )
+                    # One query instead of exists() + first()
+                    time_record = pending_record or matching_records.first()
+                    
+                    if time_record is not None:
                         # Update the first matching record (if duplicates exist, update first one)
-                        time_record = matching_records.first()
                         time_record.employee_name = employee_name
                         time_record.project_id = project_id
                         time_record.project_name = project_name
                         time_record.start_time = start_dt
                         time_record.end_time = end_dt
                         time_record.duration_seconds = duration_seconds
-                        time_record.save()
+                        if pending_record is None:
+                            records_to_update[time_record.pk] = time_record
                         created = False
                         logger.debug(f"Updated existing productive record: {employee_name} - {task} at {start_dt}")
                     else:
                         # No matching record found, create new one
                         time_record = TimeRecord(
-                            id=str(uuid.uuid4()),
                             employee_id=employee_id,
                             employee_name=employee_name,
                             project_id=project_id,
@@ -1114,7 +1219,9 @@ def sync_timesheet_data():
                             end_time=end_dt,
                             duration_seconds=duration_seconds
                         )
-                        time_record.save()
+                        records_to_create[
+                            (employee_id, start_minute, task, False)
+                        ] = time_record
                         created = True
                         logger.debug(f"Created new productive record: {employee_name} - {task} at {start_dt}")
                     
@@ -1189,22 +1296,27 @@ def sync_timesheet_data():
                         is_non_productive=True
                     )
                     
-                    if matching_records.exists():
+                    pending_record = records_to_create.get(
+                        (employee_id, start_minute, task, True)
+                    )
+                    # One query instead of exists() + first()
+                    time_record = pending_record or matching_records.first()
+                    
+                    if time_record is not None:
                         # Update the first matching record (if duplicates exist, update first one)
-                        time_record = matching_records.first()
                         time_record.employee_name = employee_name
                         time_record.project_id = None
                         time_record.project_name = None
                         time_record.start_time = start_dt
                         time_record.end_time = end_dt
                         time_record.duration_seconds = duration_seconds
-                        time_record.save()
+                        if pending_record is None:
+                            records_to_update[time_record.pk] = time_record
                         created = False
                         logger.debug(f"Updated existing non-productive record: {employee_name} - {task} at {start_dt}")
                     else:
                         # No matching record found, create new one
                         time_record = TimeRecord(
-                            id=str(uuid.uuid4()),
                             employee_id=employee_id,
                             employee_name=employee_name,
                             project_id=None,
@@ -1215,7 +1327,9 @@ def sync_timesheet_data():
                             end_time=end_dt,
                             duration_seconds=duration_seconds
                         )
-                        time_record.save()
+                        records_to_create[
+                            (employee_id, start_minute, task, True)
+                        ] = time_record
                         created = True
                         logger.debug(f"Created new non-productive record: {employee_name} - {task} at {start_dt}")
                     
@@ -1233,6 +1347,18 @@ def sync_timesheet_data():
         except Exception as e:
             logger.warning(f"Error reading non-productive records from Excel: {e}")
         
+        # Write all upserts in a few batched queries inside one transaction
+        with transaction.atomic():
+            TimeRecord.objects.bulk_create(
+                records_to_create.values(), batch_size=500
+            )
+            TimeRecord.objects.bulk_update(
+                records_to_update.values(),
+                ['employee_name', 'project_id', 'project_name',
+                 'start_time', 'end_time', 'duration_seconds'],
+                batch_size=500
+            )
+        
         logger.info(f"Upserted {upserted_from_excel} records from Excel to DB (inserted: {inserted_count}, updated: {updated_count})")
         
         # Step 2: Get all records from database
@@ -1249,10 +1375,7 @@ def sync_timesheet_data():
             
             # Format duration
             duration_seconds = record.duration_seconds or 0
-            hours = duration_seconds // 3600
-            minutes = (duration_seconds % 3600) // 60
-            seconds = duration_seconds % 60
-            duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            duration_formatted = format_time(duration_seconds)
             
             # Convert seconds to hours (decimal, rounded to 2 decimal places)
             duration_hours = round(duration_seconds / 3600.0, 2)
@@ -1355,10 +1478,7 @@ def export_to_excel(request):
             
             # Format duration
             duration_seconds = record.duration_seconds or 0
-            hours = duration_seconds // 3600
-            minutes = (duration_seconds % 3600) // 60
-            seconds = duration_seconds % 60
-            duration_formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            duration_formatted = format_time(duration_seconds)
             
             # Convert seconds to hours (decimal, rounded to 2 decimal places)
             duration_hours = round(duration_seconds / 3600.0, 2)
@@ -1477,7 +1597,8 @@ def sync_to_excel(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST method allowed'}, status=405)
     
-    result = sync_timesheet_data()
+    with _excel_write_lock:
+        result = sync_timesheet_data()
     
     if result['success']:
         return JsonResponse(result, json_dumps_params={'ensure_ascii': False})
@@ -2867,15 +2988,28 @@ def bulk_save_time_records(request):
             records_to_update = []
             record_ids_to_update = []
             
+            # Fetch the edited records and the employees/projects they are moved to
+            # up front, one query each, instead of separate lookups for every row
+            records_by_id = TimeRecord.objects.in_bulk(
+                [update_data.get('id') for update_data in updates if update_data.get('id')]
+            )
+            employees_by_id = Employee.objects.filter(is_active=True).only('id', 'name').in_bulk({
+                update_data.get('employee_id', '').strip()
+                for update_data in updates if 'employee_id' in update_data
+            })
+            projects_by_id = Project.objects.filter(is_active=True).only('id', 'name', 'project_description').in_bulk({
+                update_data.get('project_id', '').strip()
+                for update_data in updates if 'project_id' in update_data
+            })
+            
             for update_data in updates:
                 record_id = update_data.get('id')
                 if not record_id:
                     results['errors'].append({'id': None, 'error': 'Missing record ID'})
                     continue
                 
-                try:
-                    record = TimeRecord.objects.get(id=record_id)
-                except TimeRecord.DoesNotExist:
+                record = records_by_id.get(record_id)
+                if record is None:
                     results['errors'].append({'id': record_id, 'error': 'Record not found'})
                     continue
                 
@@ -2918,12 +3052,12 @@ def bulk_save_time_records(request):
                 if 'employee_id' in update_data:
                     employee_id = update_data.get('employee_id', '').strip()
                     if employee_id:
-                        try:
-                            employee = Employee.objects.get(id=employee_id, is_active=True)
+                        employee = employees_by_id.get(employee_id)
+                        if employee is not None:
                             record.employee_id = employee.id
                             record.employee_name = employee.name
                             updated = True
-                        except Employee.DoesNotExist:
+                        else:
                             results['errors'].append({'id': record_id, 'error': f'Employee not found: {employee_id}'})
                             continue
                     else:
@@ -2934,12 +3068,12 @@ def bulk_save_time_records(request):
                 if 'project_id' in update_data:
                     project_id = update_data.get('project_id', '').strip()
                     if project_id:
-                        try:
-                            project = Project.objects.get(id=project_id, is_active=True)
+                        project = projects_by_id.get(project_id)
+                        if project is not None:
                             record.project_id = project.id
                             record.project_name = project.project_description or project.name
                             updated = True
-                        except Project.DoesNotExist:
+                        else:
                             record.project_id = None
                             record.project_name = None
                             updated = True
@@ -3569,6 +3703,11 @@ def topup_apply(request):
     applied = []
     errors = []
     with transaction.atomic():
+        # One query for all targeted records, one batched UPDATE at the end
+        records_by_id = TimeRecord.objects.in_bulk(
+            [item.get('record_id') for item in updates if item.get('record_id')]
+        )
+        changed = {}
         for item in updates:
             rid = item.get('record_id')
             add_hours = item.get('add_hours', 0)
@@ -3580,9 +3719,8 @@ def topup_apply(request):
             except (TypeError, ValueError):
                 errors.append({'record_id': rid, 'error': 'Invalid add_hours'})
                 continue
-            try:
-                record = TimeRecord.objects.get(id=rid)
-            except TimeRecord.DoesNotExist:
+            record = records_by_id.get(rid)
+            if record is None:
                 errors.append({'record_id': rid, 'error': 'Record not found'})
                 continue
             prev_sec = record.duration_seconds or 0
@@ -3592,8 +3730,12 @@ def topup_apply(request):
             new_sec = prev_sec + add_sec
             record.duration_seconds = new_sec
             record.end_time = record.start_time + timedelta(seconds=new_sec)
-            record.save()
+            changed[record.pk] = record
             applied.append(rid)
+        if changed:
+            TimeRecord.objects.bulk_update(
+                list(changed.values()), ['duration_seconds', 'end_time'], batch_size=500
+            )
 
     return JsonResponse({
         'success': True,
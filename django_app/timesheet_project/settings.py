@@ -88,13 +88,21 @@ WSGI_APPLICATION = 'timesheet_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Keep database connections open between requests (seconds, 0 = close after
+# each request) and check them before reuse so dropped connections reconnect
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
 # Support both DATABASE_URL format and separate variables
 db_url = os.environ.get('DATABASE_URL', '')
 if db_url:
     try:
         import dj_database_url
         DATABASES = {
-            'default': dj_database_url.parse(db_url)
+            'default': dj_database_url.parse(
+                db_url,
+                conn_max_age=DB_CONN_MAX_AGE,
+                conn_health_checks=True,
+            )
         }
     except ImportError:
         # Fallback if dj_database_url not installed
@@ -118,6 +126,8 @@ if not db_url:
                 'PASSWORD': db_password,
                 'HOST': db_host,
                 'PORT': db_port,
+                'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+                'CONN_HEALTH_CHECKS': True,
                 'OPTIONS': {
                     'client_encoding': 'UTF8',
                 },
@@ -189,6 +199,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Session configuration
 # https://docs.djangoproject.com/en/5.2/topics/http/sessions/
 
+# Session storage backend (default: database)
+# django.contrib.sessions.backends.cached_db serves session reads from the cache
+# and skips the django_session query on a hit, but only use it together with a
+# shared CACHES backend (Redis/Memcached): with the default per-process LocMemCache
+# a logout only clears the session in the worker that handled it, and other
+# workers keep accepting it from their own cache until the entry expires.
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE', 'django.contrib.sessions.backends.db'
+)
+
 # Session expires after inactivity (in seconds)
 # Default: 2 weeks (1209600 seconds)
 # Set to None to expire when browser closes